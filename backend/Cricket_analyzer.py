@@ -1,4 +1,5 @@
 import matplotlib.pyplot as plt
+from innings import InningsState
 
 def text_report(runs,batsman):
     l, over = analyze(runs, batsman)
@@ -52,57 +53,19 @@ class LL:
             balls.append(cur.balls)
         return batters,tRuns,balls
 
-def analyze(runs, batsman):
-    b=1
-    bat1=batsman[0]
-    bat2=batsman[b]
+def analyze(runs, batsman, state=None):
+    """
+    Partnership list and over-wise (over, runs, wickets) rows read from an
+    InningsState (replayed from runs when no state is passed)
+    """
+    if state is None:
+        state=InningsState.from_deliveries(runs, [], batsman)
     l=LL()
-    pair=l.newpair(bat1,bat2)
-    w=0
-    overruns=0
-    overcount=1
-    over=[]
-    cur=bat1
-    for i,n in enumerate(runs):
-        if str(n).lower() == "w":
-            pair.balls+=1
-            w+=1
-            b+=1
-            if b<len(batsman):
-                if cur==bat1:
-                    bat1=batsman[b]
-                    pair=l.newpair(bat1,bat2)
-                    cur=bat1
-                else:
-                    bat2=batsman[b]
-                    pair=l.newpair(bat2,bat1)
-                    cur=bat2
-            else: break
-        else:
-            if n=="WD":
-                pair.runs+=1
-                overruns+=1
-                continue
-            elif type(n)==str and n.startswith("LB"):
-                n=int(n[2:])
-            elif type(n)==str and n.startswith("B"):
-                n=int(n[1:])
-            pair.runs+=n
-            pair.balls+=1
-            overruns+=n
-            if n%2==1:
-                cur= bat2 if cur==bat1 else bat1
-        
-        if (i+1)%6==0:
-            over.append((overcount,overruns,w))
-            overcount+=1
-            overruns=0
-            w=0
-            cur= bat2 if cur==bat1 else bat1
-    
-    over.append((overcount,overruns,w))
-    overruns=0
-    w=0
+    for p in state.partnerships:
+        pair=l.newpair(*p["pair"])
+        pair.runs=p["runs"]
+        pair.balls=p["balls"]
+    over=state.over_rows()
     return l,over
 
 # def match_report_and_stats(runs_list, batsman_list):
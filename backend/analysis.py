@@ -0,0 +1,504 @@
+"""
+Per-innings analysis pipeline and response assembly for /cricket-analysis
+Every analysis is a stage with named dependencies, so a request only runs
+what its selected sections need (e.g. "overs" never builds the networkx graph)
+"""
+
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from Cricket_analyzer import analyze
+from cric import analyze_bowling_stats, bowler_rows, bowling_orders
+from dsa import batter_vs_bowler_graph
+from dsa_info import cricket_analysis, cricket_analysis_log
+from delivery_log import DeliveryLog
+from batting_sort import RUNS_THEN_BALLS, batting_orders, sort_batting_stats, top_k
+from innings import InningsState
+from player_index import player_index
+
+from dsa2 import (
+    find_weakest_bowler_per_batter,
+    find_strongest_bowler_per_batter,
+    calculate_bowler_centrality,
+    optimal_bowler_assignment,
+    OverAnalyzer,
+    PlayerStatsBST,
+    optimal_bowling_allocation,
+    detect_scoring_patterns,
+    detect_duplicate_overs,
+    cluster_batters_by_common_dismissals,
+    BowlerScheduler
+)
+
+
+class Pipeline:
+    """
+    Stages with named dependencies
+    - stage(name, *deps) registers fn(inputs, *dep_results)
+    - run(targets, inputs) computes the targets and what they depend on,
+      each stage once, in dependency order; with an executor every stage is
+      submitted as soon as its dependencies are done, so independent stages
+      run concurrently
+    """
+
+    def __init__(self):
+        self.stages = {}
+
+    def stage(self, name, *deps):
+        def register(fn):
+            self.stages[name] = (deps, fn)
+            return fn
+        return register
+
+    def plan(self, targets, done=()):
+        """Stage names needed for targets in dependency order, skipping done ones"""
+        order = []
+        seen = set(done)
+
+        def visit(name):
+            if name in seen:
+                return
+            seen.add(name)
+            deps, _ = self.stages[name]
+            for dep in deps:
+                visit(dep)
+            order.append(name)
+
+        for name in targets:
+            visit(name)
+        return order
+
+    def run(self, targets, inputs, executor=None):
+        """{stage name: result} for the targets and every stage they needed"""
+        results = {}
+        order = self.plan(targets)
+        if executor is None:
+            for name in order:
+                deps, fn = self.stages[name]
+                results[name] = fn(inputs, *[results[dep] for dep in deps])
+            return results
+
+        waiting = {name: set(self.stages[name][0]) for name in order}
+        running = {}
+        while waiting or running:
+            for name in [name for name, deps in waiting.items() if not deps]:
+                del waiting[name]
+                deps, fn = self.stages[name]
+                running[executor.submit(fn, inputs, *[results[dep] for dep in deps])] = name
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                for deps in waiting.values():
+                    deps.discard(name)
+        return results
+
+
+# =============================================================================
+# PER-INNINGS STAGES
+# inputs: runs, bowlers, batters, max_overs_per_bowler, total_overs
+# =============================================================================
+
+innings_pipeline = Pipeline()
+
+@innings_pipeline.stage("state")
+def _state(inp):
+    # one ball-by-ball pass, shared by every analyzer below
+    return InningsState.from_deliveries(inp["runs"], inp["bowlers"], inp["batters"])
+
+@innings_pipeline.stage("scorecard", "state")
+def _scorecard(inp, state):
+    # batter_info, bowler_info, extras, over_table
+    return cricket_analysis(inp["runs"], inp["bowlers"], inp["batters"], state=state, as_table=True)
+
+@innings_pipeline.stage("graph", "state")
+def _graph(inp, state):
+    G, _ = batter_vs_bowler_graph(inp["runs"], inp["bowlers"], inp["batters"], state=state)
+    return G
+
+@innings_pipeline.stage("economies", "scorecard")
+def _economies(inp, scorecard):
+    return bowler_economies(scorecard[1])
+
+def bowler_economies(bowler_info):
+    """(name, stats, overs bowled, runs per over) for every bowler"""
+    rows = []
+    for bowler, stats in bowler_info.items():
+        overs = len(stats["overs"])
+        economy = stats["runs"] / overs if overs > 0 else 0
+        rows.append((bowler, stats, overs, economy))
+    return rows
+
+# ---- JSON-ready outputs (what the result cache keeps) ----
+
+@innings_pipeline.stage("players", "scorecard")
+def _players(inp, scorecard):
+    return list(scorecard[0]) + list(scorecard[1])
+
+@innings_pipeline.stage("score", "state")
+def _score(inp, state):
+    return {"runs": state.score, "wickets": state.wickets, "balls": state.legal_balls}
+
+@innings_pipeline.stage("extras", "scorecard")
+def _extras(inp, scorecard):
+    return scorecard[2]
+
+# =============================================================================
+# ORIGINAL CODE - BATTERS, BOWLERS & OVERS
+# =============================================================================
+
+def batter_row(player, stats):
+    """One batters[] entry from a batter_info line"""
+    balls = stats["balls"]
+    sr = round((stats["runs"] / balls) * 100, 1) if balls > 0 else 0.0
+    return {
+        "player": player,
+        "runs": stats["runs"],
+        "balls": balls,
+        "sr": sr,
+        "fours": stats["4s"],
+        "sixes": stats["6s"]
+    }
+
+def partnership_row(partnership):
+    """One partnerships[] entry from an InningsState partnership"""
+    return {
+        "batsmen": " & ".join(str(name) for name in partnership["pair"]),
+        "runs": partnership["runs"],
+        "balls": partnership["balls"]
+    }
+
+@innings_pipeline.stage("batters", "scorecard")
+def _batters(inp, scorecard):
+    return [batter_row(player, stats) for player, stats in scorecard[0].items()]
+
+@innings_pipeline.stage("sorted_batters", "batters")
+def _sorted_batters(inp, batter_list):
+    return sort_batting_stats(batter_list)
+
+@innings_pipeline.stage("bowling", "scorecard")
+def _bowling(inp, scorecard):
+    return analyze_bowling_stats(scorecard[1])
+
+# ---- index layout: one row list plus orderings instead of sorted copies ----
+
+@innings_pipeline.stage("batter_order", "batters")
+def _batter_order(inp, batter_list):
+    return batting_orders(batter_list)
+
+@innings_pipeline.stage("bowler_rows", "scorecard")
+def _bowler_rows(inp, scorecard):
+    return bowler_rows(scorecard[1])
+
+@innings_pipeline.stage("bowler_order", "bowler_rows")
+def _bowler_order(inp, bowler_rows):
+    return bowling_orders(bowler_rows)
+
+@innings_pipeline.stage("overs", "scorecard")
+def _overs(inp, scorecard):
+    return scorecard[3].records()
+
+# =============================================================================
+# ORIGINAL CODE - PARTNERSHIPS
+# =============================================================================
+
+@innings_pipeline.stage("partnerships", "state")
+def _partnerships(inp, state):
+    pairs, _ = analyze(inp["runs"], inp["batters"], state=state)
+    pair_names, pair_runs, pair_balls = pairs.display()
+    return [
+        {
+            "batsmen": pair.replace("-", " & "),
+            "runs": pair_runs[i],
+            "balls": pair_balls[i]
+        }
+        for i, pair in enumerate(pair_names)
+    ]
+
+# =============================================================================
+# ORIGINAL CODE - BATTER VS BOWLER
+# =============================================================================
+
+@innings_pipeline.stage("batter_vs_bowler", "graph")
+def _batter_vs_bowler(inp, G):
+    result = {}
+    for striker in G.nodes:
+        if G.nodes[striker].get("role") != "batter":
+            continue
+
+        result[striker] = []
+        for bowler in G[striker]:
+            data = G[striker][bowler]
+            balls = data.get("balls", 0)
+            runs = data.get("runs", 0)
+            wickets = data.get("wickets", 0)
+            sr = round((runs / balls * 100), 1) if balls > 0 else 0.0
+
+            result[striker].append({
+                "bowler": bowler,
+                "runs": runs,
+                "balls": balls,
+                "wicket": wickets > 0,
+                "sr": sr
+            })
+    return result
+
+# =============================================================================
+# DSA 2.0 FUNCTIONS
+# =============================================================================
+
+@innings_pipeline.stage("graph_analysis", "graph")
+def _graph_analysis(inp, G):
+    return {
+        "weakest_bowler_matchups": find_weakest_bowler_per_batter(G),
+        "strongest_bowler_matchups": find_strongest_bowler_per_batter(G),
+        "bowler_centrality": calculate_bowler_centrality(G),
+        # Optimal bowler assignment for top batters
+        "optimal_assignment": optimal_bowler_assignment(G, inp["batters"][:3])
+    }
+
+@innings_pipeline.stage("over_analysis", "scorecard")
+def _over_analysis(inp, scorecard):
+    over_table = scorecard[3]
+    prefix_runs, prefix_wickets = OverAnalyzer.build_prefix_sums(over_table)
+    return {
+        "best_powerplay": OverAnalyzer.best_k_consecutive_overs(over_table, 6),
+        "best_middle_overs": OverAnalyzer.best_k_consecutive_overs(over_table, 4),
+        "rolling_run_rate": OverAnalyzer.rolling_run_rate(over_table, window_size=6),
+        "prefix_runs": prefix_runs,
+        "prefix_wickets": prefix_wickets
+    }
+
+@innings_pipeline.stage("bst_search", "scorecard")
+def _bst_search(inp, scorecard):
+    bst = PlayerStatsBST()
+    for player, stats in scorecard[0].items():
+        bst.insert(player, stats["runs"])
+    return {
+        "batters_above_30": bst.find_first_above_threshold(30),
+        "batters_above_50": bst.find_first_above_threshold(50)
+    }
+
+@innings_pipeline.stage("optimal_bowling_allocation", "economies")
+def _optimal_bowling_allocation(inp, economies):
+    bowlers_for_dp = [{"name": bowler, "economy": economy} for bowler, _, _, economy in economies]
+    return optimal_bowling_allocation(bowlers_for_dp, inp["max_overs_per_bowler"], inp["total_overs"])
+
+@innings_pipeline.stage("next_bowler_recommendation", "scorecard", "state")
+def _next_bowler(inp, scorecard, state):
+    # heapified once from the figures; LiveMatch keeps one per innings instead.
+    # The bowler of the last delivery cannot bowl the next over
+    last = state.deliveries[-1].bowler if state.deliveries else None
+    scheduler = BowlerScheduler.from_bowler_info(scorecard[1], inp["max_overs_per_bowler"], last_bowler=last)
+    return scheduler.get_next_bowler()
+
+@innings_pipeline.stage("pattern_detection", "scorecard")
+def _pattern_detection(inp, scorecard):
+    return {
+        "scoring_patterns": detect_scoring_patterns(inp["runs"], pattern_length=4),
+        "duplicate_overs": detect_duplicate_overs(scorecard[3])
+    }
+
+@innings_pipeline.stage("batter_clusters", "graph")
+def _batter_clusters(inp, G):
+    return cluster_batters_by_common_dismissals(G)
+
+
+# Stages whose results are JSON-ready and safe to cache
+INNINGS_OUTPUTS = (
+    "players", "score", "extras", "batters", "sorted_batters", "bowling", "overs",
+    "partnerships", "batter_vs_bowler", "graph_analysis", "over_analysis", "bst_search",
+    "optimal_bowling_allocation", "next_bowler_recommendation", "pattern_detection",
+    "batter_clusters"
+)
+
+def innings_inputs(runs, bowlers, batters, max_overs_per_bowler=4, total_overs=20):
+    return {
+        "runs": runs,
+        "bowlers": bowlers,
+        "batters": batters,
+        "max_overs_per_bowler": max_overs_per_bowler,
+        "total_overs": total_overs
+    }
+
+def analyze_innings(runs, bowlers, batters, max_overs_per_bowler=4, total_overs=20, outputs=INNINGS_OUTPUTS,
+                    executor=None):
+    """
+    Per-innings analyses for one batting side
+    Returns {output name: JSON-ready result} for the requested outputs;
+    independent stages run concurrently on executor when one is given
+    """
+    inputs = innings_inputs(runs, bowlers, batters, max_overs_per_bowler, total_overs)
+    results = innings_pipeline.run(outputs, inputs, executor)
+    return {name: results[name] for name in outputs}
+
+
+# =============================================================================
+# RESPONSE SECTIONS
+# section name -> (innings outputs it reads, builder(a, b, predictingdata))
+# =============================================================================
+
+def _batters_section(a, b, predictingdata):
+    return {
+        "batters": a["batters"],
+        "battersB": b["batters"],
+
+        "batters_sorted_runs": a["sorted_batters"]["sorted_by_runs"],
+        "batters_sorted_sr": a["sorted_batters"]["sorted_by_sr"],
+        "batters_sorted_fours": a["sorted_batters"]["sorted_by_fours"],
+        "batters_sorted_sixes": a["sorted_batters"]["sorted_by_sixes"],
+
+        "battersB_sorted_runs": b["sorted_batters"]["sorted_by_runs"],
+        "battersB_sorted_sr": b["sorted_batters"]["sorted_by_sr"],
+        "battersB_sorted_fours": b["sorted_batters"]["sorted_by_fours"],
+        "battersB_sorted_sixes": b["sorted_batters"]["sorted_by_sixes"]
+    }
+
+def _bowlers_section(a, b, predictingdata):
+    return {
+        "bowlers_wickets": a["bowling"]["sorted_by_wickets"],
+        "bowlers_runs": a["bowling"]["sorted_by_runs"],
+        "bowlers_economy": a["bowling"]["sorted_by_economy"],
+        "bowlers_wicketsB": b["bowling"]["sorted_by_wickets"],
+        "bowlers_runsB": b["bowling"]["sorted_by_runs"],
+        "bowlers_economyB": b["bowling"]["sorted_by_economy"]
+    }
+
+def _batters_index_section(a, b, predictingdata):
+    return {
+        "batters": a["batters"],
+        "battersB": b["batters"],
+        "batters_order": a["batter_order"],
+        "battersB_order": b["batter_order"]
+    }
+
+def _bowlers_index_section(a, b, predictingdata):
+    return {
+        "bowlers": a["bowler_rows"],
+        "bowlersB": b["bowler_rows"],
+        "bowlers_order": a["bowler_order"],
+        "bowlers_orderB": b["bowler_order"]
+    }
+
+def _overs_section(a, b, predictingdata):
+    over_result = []
+    for ob, oa in zip(b["overs"], a["overs"]):
+        over_result.append({
+            "over": str(ob["over"]),
+            "teamA": ob["runs"],
+            "teamAWickets": ob["wickets"],
+            "teamB": oa["runs"],
+            "teamBWickets": oa["wickets"]
+        })
+    return {"overs": over_result}
+
+def _player_search_section(a, b, predictingdata):
+    # Only this match's players, ranked by their appearances in the process-wide index
+    players = a["players"] + b["players"]
+    return {
+        "player_search": {
+            "search_s": player_index.search_among("s", players),
+            "search_shah": player_index.search_among("shah", players),
+            "search_ab": player_index.search_among("ab", players)
+        }
+    }
+
+def _per_team(key, output=None):
+    """Section that is just {"teamA": a[output], "teamB": b[output]}"""
+    output = output or key
+    return ((output,), lambda a, b, p: {key: {"teamA": a[output], "teamB": b[output]}})
+
+SECTIONS = {
+    "batters": (("batters", "sorted_batters"), _batters_section),
+    "bowlers": (("bowling",), _bowlers_section),
+    "extras": (("extras",), lambda a, b, p: {"extras": a["extras"]}),
+    "overs": (("overs",), _overs_section),
+    "batter_vs_bowler": (("batter_vs_bowler",), lambda a, b, p: {
+        "batterVsBowler": a["batter_vs_bowler"], "batterVsBowlerB": b["batter_vs_bowler"]}),
+    "partnerships": (("partnerships",), lambda a, b, p: {
+        "partnerships": a["partnerships"], "partnershipsB": b["partnerships"]}),
+    "predictions": ((), lambda a, b, p: {"predictingData": p}),
+    "graph_analysis": _per_team("graph_analysis"),
+    "over_analysis": _per_team("over_analysis"),
+    "bst_search": _per_team("bst_search"),
+    "player_search": (("players",), _player_search_section),
+    "optimal_bowling_allocation": _per_team("optimal_bowling_allocation"),
+    "pattern_detection": _per_team("pattern_detection"),
+    "batter_clusters": _per_team("batter_clusters"),
+    "next_bowler_recommendation": _per_team("next_bowler_recommendation")
+}
+
+# layout=index: sections whose sorted copies become index permutations
+# ({metric: [row index, ...]}) into a single row list
+LAYOUTS = ("copies", "index")
+INDEX_SECTIONS = {
+    "batters": (("batters", "batter_order"), _batters_index_section),
+    "bowlers": (("bowler_rows", "bowler_order"), _bowlers_index_section)
+}
+
+def _section(name, layout):
+    if layout == "index" and name in INDEX_SECTIONS:
+        return INDEX_SECTIONS[name]
+    return SECTIONS[name]
+
+def parse_sections(*selectors):
+    """
+    Section names from comma separated selectors (fields=..., include=...),
+    all sections when none are given; raises ValueError on unknown names
+    """
+    names = [name.strip() for sel in selectors if sel for name in sel.split(",") if name.strip()]
+    if not names:
+        return list(SECTIONS)
+    unknown = [name for name in names if name not in SECTIONS]
+    if unknown:
+        raise ValueError(f"unknown sections {unknown}, expected any of {list(SECTIONS)}")
+    return [name for name in SECTIONS if name in names]
+
+def innings_outputs_for(sections, layout="copies"):
+    """Innings outputs the given response sections read"""
+    return tuple(dict.fromkeys(out for name in sections for out in _section(name, layout)[0]))
+
+def build_response(a, b, predictingdata, sections=None, layout="copies"):
+    """
+    Response body of /cricket-analysis from two analyze_innings results
+    layout="index" sends each sorted batter / bowler list as an index
+    permutation into one row list (see INDEX_SECTIONS)
+    """
+    out = {}
+    for name in sections or SECTIONS:
+        out.update(_section(name, layout)[1](a, b, predictingdata))
+    return out
+
+
+# =============================================================================
+# SEASON ROLL-UP
+# =============================================================================
+
+# Rows in the season top run scorers list
+SEASON_TOP_K = 10
+
+def season_scorecard(innings):
+    """
+    Totals over many innings, each given as (runs, bowlers, batters)
+    - every innings is tokenized once into a DeliveryLog, the logs are
+      stacked and cricket_analysis_log sums the columns in one pass
+    - batters and bowlers are keyed by name across innings
+    - top_batters: the SEASON_TOP_K best by runs, then fewer balls, picked
+      with a bounded heap
+    """
+    log = DeliveryLog.concat([DeliveryLog.from_deliveries(runs, bowlers, batters)
+                              for runs, bowlers, batters in innings])
+    batter_info, bowler_info, extras, over_table = cricket_analysis_log(log, as_table=True)
+    bowling = analyze_bowling_stats(bowler_info)
+    batters = [batter_row(player, stats) for player, stats in batter_info.items()]
+    return {
+        "innings": len(innings),
+        "runs": int(log.total_runs().sum()),
+        "wickets": int(log.wicket.sum()),
+        "overs": len(over_table),
+        "batters": batters,
+        "top_batters": top_k(batters, SEASON_TOP_K, keys=RUNS_THEN_BALLS),
+        "bowlers_wickets": bowling["sorted_by_wickets"],
+        "bowlers_runs": bowling["sorted_by_runs"],
+        "bowlers_economy": bowling["sorted_by_economy"],
+        "extras": extras
+    }
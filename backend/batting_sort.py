@@ -1,91 +1,103 @@
 """
-Heap Sort Implementation for Cricket Batting Statistics
-Sorts batters by runs, strike rate, fours, and sixes
+Cricket Batting Statistics ordering
+Sorts batters by runs, strike rate, fours, and sixes; the leaderboards
+themselves are index permutations from ranking.Ranking, and top_k picks the
+best few rows of a long list with a bounded heap
 """
 
-def heapify(arr, n, i, key):
+from ranking import BATTING_METRICS, Ranking
+
+# Runs descending, then fewer balls first
+RUNS_THEN_BALLS = [("runs", True), ("balls", False)]
+
+
+def heapify(heap, n, i):
     """
-    Heapify subtree rooted at index i
-    n = size of heap
-    key = lambda function to extract sort key
+    Iterative sift-down of heap[i] within heap[:n] (max-heap)
+    Items are compared directly, so they carry precomputed keys
     """
-    largest = i
-    left = 2 * i + 1
-    right = 2 * i + 2
-    
-    # Check if left child exists and is greater
-    if left < n and key(arr[left]) > key(arr[largest]):
-        largest = left
-    
-    # Check if right child exists and is greater
-    if right < n and key(arr[right]) > key(arr[largest]):
-        largest = right
-    
-    # If largest is not root, swap and continue heapifying
-    if largest != i:
-        arr[i], arr[largest] = arr[largest], arr[i]
-        heapify(arr, n, largest, key)
+    item = heap[i]
+    child = 2 * i + 1
+    while child < n:
+        # Pick the larger child
+        right = child + 1
+        if right < n and heap[right] > heap[child]:
+            child = right
+        if not heap[child] > item:
+            break
+        heap[i] = heap[child]
+        i = child
+        child = 2 * i + 1
+    heap[i] = item
 
 
-def heap_sort(arr, key):
+def _decorate(arr, key, keys):
     """
-    Perform heap sort on array based on key function
-    Returns sorted array in descending order
+    [(sort key, index)] for arr, smaller sort key = better row
+    - key: one function, larger values first
+    - keys: [(field name or function, descending)], compared in order
+    Every key is read once per row; descending keys are negated, so keys
+    must be numbers. The index breaks ties in input order.
     """
-    if not arr:
-        return arr
-    
-    n = len(arr)
-    
-    # Build max heap
+    if keys is None:
+        keys = [(key, True)]
+    getters = [(k if callable(k) else (lambda row, field=k: row[field]), descending) for k, descending in keys]
+    return [
+        (tuple(-get(row) if descending else get(row) for get, descending in getters), i)
+        for i, row in enumerate(arr)
+    ]
+
+
+def top_k(arr, k, key=None, keys=None):
+    """
+    The k best rows of arr, best first, without sorting all of them:
+    a bounded max-heap keeps the k best seen so far, O(n log k)
+    """
+    if k <= 0 or not arr:
+        return []
+    decorated = _decorate(arr, key, keys)
+    heap = decorated[:k]
+    n = len(heap)
     for i in range(n // 2 - 1, -1, -1):
-        heapify(arr, n, i, key)
-    
-    # Extract elements from heap one by one
+        heapify(heap, n, i)
+
+    # Replace the worst of the k kept rows whenever a better one shows up
+    for item in decorated[n:]:
+        if item < heap[0]:
+            heap[0] = item
+            heapify(heap, n, 0)
+
     for i in range(n - 1, 0, -1):
-        arr[0], arr[i] = arr[i], arr[0]  # Swap
-        heapify(arr, i, 0, key)
-    
-    # Reverse to get descending order
-    arr.reverse()
-    return arr
+        heap[0], heap[i] = heap[i], heap[0]
+        heapify(heap, i, 0)
+    return [arr[i] for _, i in heap]
 
 
 def sort_batting_stats(batter_list):
     """
-    Sort batting statistics using heap sort
+    Sort batting statistics by runs, strike rate, fours and sixes
     
     Input: List of dicts with keys: player, runs, balls, sr, fours, sixes
-    Output: Dict with four sorted lists
+    Output: Dict with four sorted lists (descending). They hold the rows of
+    batter_list themselves, no copies; ties keep batter_list order.
     """
-    # Create copies for different sorts
-    import copy
-    
-    sorted_by_runs = copy.deepcopy(batter_list)
-    sorted_by_sr = copy.deepcopy(batter_list)
-    sorted_by_fours = copy.deepcopy(batter_list)
-    sorted_by_sixes = copy.deepcopy(batter_list)
-    
-    # Sort by runs (descending)
-    heap_sort(sorted_by_runs, key=lambda x: x["runs"])
-    
-    # Sort by strike rate (descending)
-    heap_sort(sorted_by_sr, key=lambda x: x["sr"])
-    
-    # Sort by fours (descending)
-    heap_sort(sorted_by_fours, key=lambda x: x["fours"])
-    
-    # Sort by sixes (descending)
-    heap_sort(sorted_by_sixes, key=lambda x: x["sixes"])
-    
+    ranking = Ranking(batter_list, BATTING_METRICS)
     return {
-        "sorted_by_runs": sorted_by_runs,
-        "sorted_by_sr": sorted_by_sr,
-        "sorted_by_fours": sorted_by_fours,
-        "sorted_by_sixes": sorted_by_sixes
+        "sorted_by_runs": ranking.ranked("runs"),
+        "sorted_by_sr": ranking.ranked("sr"),
+        "sorted_by_fours": ranking.ranked("fours"),
+        "sorted_by_sixes": ranking.ranked("sixes")
     }
 
 
+def batting_orders(batter_list):
+    """
+    Same orderings as sort_batting_stats, as index permutations into
+    batter_list instead of sorted lists
+    """
+    return Ranking(batter_list, BATTING_METRICS).orders()
+
+
 # Test with sample data
 if __name__ == "__main__":
     sample_batters = [
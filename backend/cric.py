@@ -1,93 +1,124 @@
-import heapq
+from bisect import bisect_left, insort
+
+from ranking import BOWLING_METRICS, Ranking
+
+
+def bowler_rows(bowlers_data):
+    """One {'name', 'economy', 'runs', 'wickets', 'overs'} row per bowler, in bowlers_data order"""
+    rows = []
+    for bowler_name, stats in bowlers_data.items():
+        # Calculate total overs bowled and economy rate (runs per over)
+        total_overs = len(stats['overs'])
+        economy = stats['runs'] / total_overs if total_overs > 0 else 0
+        rows.append({
+            'name': bowler_name,
+            'economy': economy,
+            'runs': stats['runs'],
+            'wickets': stats['wickets'],
+            'overs': total_overs
+        })
+    return rows
+
+
+def bowling_ranking(bowlers_data):
+    """Ranking over bowler_rows by economy, runs (ascending) and wickets (descending)"""
+    return Ranking(bowler_rows(bowlers_data), BOWLING_METRICS)
+
 
 def analyze_bowling_stats(bowlers_data):
     """
-    Analyze bowling statistics using heaps
+    Analyze bowling statistics
     
     Args:
         bowlers_data: Dictionary with structure:
                      {'bowler_name': {'overs': [1,2,4], 'runs': 20, 'wickets': 2}, ...}
     
     Returns:
-        Dictionary containing sorted lists by different metrics
+        Dictionary containing sorted lists by different metrics. The lists
+        share one row per bowler (no copies); ties keep bowlers_data order.
     """
-    
-    # Heaps for different metrics
-    # Python heapq is min-heap, so negate values for max-heap behavior
-    economy_heap = []  # Min heap for economy (ascending)
-    runs_heap = []     # Min heap for runs (ascending)
-    wickets_heap = []  # Max heap for wickets (descending - negate values)
-    
-    results = {}
-    
-    # Process each bowler
-    for bowler_name, stats in bowlers_data.items():
-        overs = stats['overs']
-        runs = stats['runs']
-        wickets = stats['wickets']
-        
-        # Calculate total overs bowled
-        total_overs = len(overs)
-        
-        # Calculate economy rate (runs per over)
-        if total_overs > 0:
-            economy = runs / total_overs
+    ranking = bowling_ranking(bowlers_data)
+    return {
+        # i) Sort by Economy (Ascending)
+        'sorted_by_economy': ranking.ranked('economy'),
+        # ii) Sort by Runs (Ascending)
+        'sorted_by_runs': ranking.ranked('runs'),
+        # iii) Sort by Wickets (Descending)
+        'sorted_by_wickets': ranking.ranked('wickets')
+    }
+
+
+def bowling_orders(bowler_rows):
+    """
+    Same orderings as analyze_bowling_stats, as index permutations into
+    bowler_rows ({'name', 'economy', 'runs', 'wickets', 'overs'} dicts)
+    """
+    return Ranking(bowler_rows, BOWLING_METRICS).orders()
+
+
+class BowlingLeaderboard:
+    """
+    Bowling rankings kept up to date one bowler at a time (live matches)
+    - update(bowler, runs, wickets, overs) sets one bowler's figures
+    - ranked(metric, k) gives rows best first, in the same order
+      analyze_bowling_stats would on the same figures
+    - Each metric in BOWLING_METRICS is a bisect-sorted list of
+      (sort key, seq) where seq numbers bowlers in the order first seen, so
+      ties keep that order. An update is a binary search to drop the old
+      entry and insort for the new one per metric: O(log n) comparisons
+      plus an O(n) memmove, no re-sort.
+    """
+
+    def __init__(self):
+        self.rows = {}
+        self.seq = {}
+        self.names = []
+        self.entries = {metric: [] for metric in BOWLING_METRICS}
+
+    @classmethod
+    def from_bowler_info(cls, bowlers_data):
+        board = cls()
+        for name, stats in bowlers_data.items():
+            board.update(name, stats['runs'], stats['wickets'], len(stats['overs']))
+        return board
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _entry(self, metric, row, seq):
+        field, descending = BOWLING_METRICS[metric]
+        return (-row[field] if descending else row[field], seq)
+
+    def update(self, bowler, runs, wickets, overs):
+        """Set a bowler's figures (adding the bowler when new)"""
+        old = self.rows.get(bowler)
+        if old is None:
+            seq = self.seq[bowler] = len(self.names)
+            self.names.append(bowler)
         else:
-            economy = 0
-        
-        # Push to heaps
-        # Economy heap - Min heap (ascending order - best economy first)
-        heapq.heappush(economy_heap, (economy, bowler_name, runs, wickets, total_overs))
-        
-        # Runs heap - Min heap (ascending order - least runs first)
-        heapq.heappush(runs_heap, (runs, bowler_name, economy, wickets, total_overs))
-        
-        # Wickets heap - Max heap (descending order - most wickets first)
-        heapq.heappush(wickets_heap, (-wickets, bowler_name, economy, runs, total_overs))
-    
-    # i) Sort by Economy (Ascending)
-    sorted_by_economy = []
-    temp_heap = economy_heap.copy()
-    while temp_heap:
-        economy, name, runs, wickets, overs = heapq.heappop(temp_heap)
-        sorted_by_economy.append({
-            'name': name,
-            'economy': economy,
-            'runs': runs,
-            'wickets': wickets,
-            'overs': overs
-        })
-    results['sorted_by_economy'] = sorted_by_economy
-    
-    # ii) Sort by Runs (Ascending)
-    sorted_by_runs = []
-    temp_heap = runs_heap.copy()
-    while temp_heap:
-        runs, name, economy, wickets, overs = heapq.heappop(temp_heap)
-        sorted_by_runs.append({
-            'name': name,
+            seq = self.seq[bowler]
+        row = {
+            'name': bowler,
+            'economy': runs / overs if overs > 0 else 0,
             'runs': runs,
-            'economy': economy,
             'wickets': wickets,
             'overs': overs
-        })
-    results['sorted_by_runs'] = sorted_by_runs
-    
-    # iii) Sort by Wickets (Descending)
-    sorted_by_wickets = []
-    temp_heap = wickets_heap.copy()
-    while temp_heap:
-        neg_wickets, name, economy, runs, overs = heapq.heappop(temp_heap)
-        sorted_by_wickets.append({
-            'name': name,
-            'wickets': -neg_wickets,
-            'economy': economy,
-            'runs': runs,
-            'overs': overs
-        })
-    results['sorted_by_wickets'] = sorted_by_wickets
-    
-    return results
+        }
+        for metric, entries in self.entries.items():
+            if old is not None:
+                del entries[bisect_left(entries, self._entry(metric, old, seq))]
+            insort(entries, self._entry(metric, row, seq))
+        self.rows[bowler] = row
+
+    def rank(self, metric, bowler):
+        """0-based position of bowler in the metric's ranking"""
+        return bisect_left(self.entries[metric], self._entry(metric, self.rows[bowler], self.seq[bowler]))
+
+    def ranked(self, metric, k=None):
+        return [self.rows[self.names[seq]] for _, seq in self.entries[metric][:k]]
+
+    def ranked_names(self, metric, k=None):
+        return [self.names[seq] for _, seq in self.entries[metric][:k]]
 
 
 def print_results(results):
@@ -0,0 +1,143 @@
+"""
+Columnar delivery log
+Tokenizes a delivery list such as [0, 4, "W", "WD", "LB1", "B1", ...] once
+into NumPy int8/int16 columns so analyzers can work on integer arrays
+instead of re-parsing strings
+"""
+
+import numpy as np
+
+from innings import InningsState
+
+# extra_type codes, 0 is a ball off the bat
+EXTRA_NONE, EXTRA_WD, EXTRA_NB, EXTRA_LB, EXTRA_B = 0, 1, 2, 3, 4
+EXTRA_CODES = {None: EXTRA_NONE, "WD": EXTRA_WD, "NB": EXTRA_NB, "LB": EXTRA_LB, "B": EXTRA_B}
+EXTRA_NAMES = ("", "WD", "NB", "LB", "B")
+
+# column name -> dtype
+COLUMNS = (
+    ("bat_runs", np.int8),
+    ("extra_type", np.int8),
+    ("extra_runs", np.int8),
+    ("wicket", np.int8),
+    ("legal", np.int8),
+    ("over", np.int16),
+    ("ball", np.int8),
+    ("striker", np.int16),
+    ("bowler", np.int16),
+    ("match", np.int16),
+)
+
+
+class DeliveryLog:
+    """
+    Struct-of-arrays view of one or more innings
+    - one NumPy column per field in COLUMNS, all the same length
+    - striker / bowler are ids into self.batters / self.bowlers
+    - over is 1-based, ball is the legal ball count within the over
+      (an illegal delivery repeats the previous ball number)
+    - match tells concatenated innings apart (0 for a single innings)
+    """
+
+    def __init__(self, batters, bowlers, columns):
+        self.batters = list(batters)
+        self.bowlers = list(bowlers)
+        for name, dtype in COLUMNS:
+            setattr(self, name, np.asarray(columns[name], dtype=dtype))
+
+    @classmethod
+    def from_deliveries(cls, runs, bowlers, batters):
+        """
+        Parse a delivery list once; bowlers is the planned bowler for each
+        over as elsewhere in the backend. Deliveries after the side is all
+        out are dropped. Without a bowling plan every delivery gets one
+        sentinel bowler id whose name is None, as in InningsState.bowler_info.
+        """
+        state = InningsState(batters, bowlers, record=False)
+        bowler_names = list(dict.fromkeys(bowlers))
+        bowler_ids = {name: i for i, name in enumerate(bowler_names)}
+
+        n = len(runs)
+        cols = {name: np.zeros(n, dtype=dtype) for name, dtype in COLUMNS}
+        bat_runs, extra_type, extra_runs = cols["bat_runs"], cols["extra_type"], cols["extra_runs"]
+        wicket, legal, over, ball = cols["wicket"], cols["legal"], cols["over"], cols["ball"]
+        striker, bowler = cols["striker"], cols["bowler"]
+
+        rows = 0
+        for run in runs:
+            striker_pos = state.striker_pos
+            d = state.apply(run)
+            if d is None:
+                break
+            bat_runs[rows] = d.bat_runs
+            extra_type[rows] = EXTRA_CODES[d.kind]
+            extra_runs[rows] = d.extra_runs
+            wicket[rows] = d.wicket
+            legal[rows] = d.legal
+            over[rows] = d.over
+            ball[rows] = d.ball
+            striker[rows] = striker_pos
+            bowler_id = bowler_ids.get(d.bowler)
+            if bowler_id is None:
+                # no planned bowler (empty plan, d.bowler is None): one shared sentinel id
+                bowler_id = bowler_ids[d.bowler] = len(bowler_names)
+                bowler_names.append(d.bowler)
+            bowler[rows] = bowler_id
+            rows += 1
+
+        return cls(batters, bowler_names, {name: col[:rows] for name, col in cols.items()})
+
+    @classmethod
+    def concat(cls, logs):
+        """
+        Stack several logs (e.g. a season archive) into one, remapping player
+        ids onto a shared vocabulary and numbering each input in match
+        """
+        batters = list(dict.fromkeys(name for log in logs for name in log.batters))
+        bowlers = list(dict.fromkeys(name for log in logs for name in log.bowlers))
+        batter_ids = {name: i for i, name in enumerate(batters)}
+        bowler_ids = {name: i for i, name in enumerate(bowlers)}
+
+        cols = {name: [] for name, _ in COLUMNS}
+        for match_no, log in enumerate(logs):
+            batter_map = np.array([batter_ids[name] for name in log.batters], dtype=np.int16)
+            bowler_map = np.array([bowler_ids[name] for name in log.bowlers], dtype=np.int16)
+            for name, _ in COLUMNS:
+                cols[name].append(getattr(log, name))
+            cols["striker"][-1] = batter_map[log.striker] if len(log) else log.striker
+            cols["bowler"][-1] = bowler_map[log.bowler] if len(log) else log.bowler
+            cols["match"][-1] = np.full(len(log), match_no, dtype=np.int16)
+
+        return cls(batters, bowlers, {
+            name: np.concatenate(cols[name]) if logs else np.zeros(0, dtype=dtype)
+            for name, dtype in COLUMNS
+        })
+
+    def __len__(self):
+        return len(self.bat_runs)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the columns"""
+        return sum(getattr(self, name).nbytes for name, _ in COLUMNS)
+
+    def total_runs(self):
+        """Runs of every delivery (bat plus extras) as an int16 column"""
+        return self.bat_runs.astype(np.int16) + self.extra_runs
+
+    def tokens(self):
+        """Rebuild the original delivery list, e.g. [0, 4, "W", "WD", "LB1"]"""
+        out = []
+        for bat, kind, extra, wkt in zip(self.bat_runs.tolist(), self.extra_type.tolist(),
+                                         self.extra_runs.tolist(), self.wicket.tolist()):
+            if wkt:
+                out.append("W")
+            elif kind == EXTRA_WD:
+                out.append("WD" if extra == 1 else f"WD{extra - 1}")
+            elif kind == EXTRA_NB:
+                out.append(f"NB{bat}" if bat else "NB")
+            elif kind:
+                out.append(f"{EXTRA_NAMES[kind]}{extra}")
+            else:
+                out.append(bat)
+        return out
@@ -7,6 +7,10 @@ import networkx as nx
 from collections import deque, defaultdict
 import heapq
 
+import numpy as np
+
+from over_table import OverTable
+
 # =============================================================================
 # 1. GRAPH ALGORITHMS ON BATTER VS BOWLER GRAPH
 # =============================================================================
@@ -163,22 +167,15 @@ def optimal_bowler_assignment(G, batters_to_target):
 
 class OverAnalyzer:
     """
-    Implements sliding window and prefix sum on linked list of overs
+    Implements sliding window and prefix sum on the overs of an innings
+    Every method takes an OverTable or the head of an OverNode linked list
     """
     
     @staticmethod
     def build_prefix_sums(overs_head):
-        """Build prefix sum array from linked list"""
-        prefix_runs = [0]
-        prefix_wickets = [0]
-        
-        curr = overs_head
-        while curr:
-            prefix_runs.append(prefix_runs[-1] + curr.runs)
-            prefix_wickets.append(prefix_wickets[-1] + curr.wickets)
-            curr = curr.next
-        
-        return prefix_runs, prefix_wickets
+        """Prefix sum arrays of runs and wickets (leading 0)"""
+        table = OverTable.coerce(overs_head)
+        return table.prefix_runs.tolist(), table.prefix_wickets.tolist()
     
     @staticmethod
     def get_runs_between_overs(prefix_runs, start_over, end_over):
@@ -191,59 +188,39 @@ class OverAnalyzer:
     def best_k_consecutive_overs(overs_head, k):
         """
         Find best k consecutive overs (max runs) using sliding window
+        over the prefix sums (earliest window wins ties)
         """
         if not overs_head or k <= 0:
             return None
         
-        # Convert to array for easier sliding window
-        overs = []
-        curr = overs_head
-        while curr:
-            overs.append({"over": curr.over_num, "runs": curr.runs, "wickets": curr.wickets})
-            curr = curr.next
-        
-        if len(overs) < k:
+        table = OverTable.coerce(overs_head)
+        if len(table) < k:
             return None
         
-        # Initialize window
-        window_runs = sum(o["runs"] for o in overs[:k])
-        max_runs = window_runs
-        best_start = 0
-        
-        # Slide window
-        for i in range(k, len(overs)):
-            window_runs += overs[i]["runs"] - overs[i - k]["runs"]
-            if window_runs > max_runs:
-                max_runs = window_runs
-                best_start = i - k + 1
+        window_runs = table.prefix_runs[k:] - table.prefix_runs[:-k]
+        best_start = int(window_runs.argmax())
         
         return {
-            "start_over": overs[best_start]["over"],
-            "end_over": overs[best_start + k - 1]["over"],
-            "total_runs": max_runs,
-            "overs": overs[best_start:best_start + k]
+            "start_over": int(table.over_num[best_start]),
+            "end_over": int(table.over_num[best_start + k - 1]),
+            "total_runs": int(window_runs[best_start]),
+            "overs": table.records(best_start, best_start + k)
         }
     
     @staticmethod
     def rolling_run_rate(overs_head, window_size=6):
         """Calculate rolling run rate over window_size overs"""
-        overs = []
-        curr = overs_head
-        while curr:
-            overs.append(curr.runs)
-            curr = curr.next
+        table = OverTable.coerce(overs_head)
+        n = len(table)
         
-        rolling_rates = []
-        for i in range(len(overs)):
-            start = max(0, i - window_size + 1)
-            window_runs = sum(overs[start:i + 1])
-            window_overs = i - start + 1
-            rolling_rates.append({
-                "over": i + 1,
-                "run_rate": round(window_runs / window_overs, 2)
-            })
+        ends = np.arange(1, n + 1)
+        starts = np.maximum(0, ends - window_size)
+        rates = (table.prefix_runs[ends] - table.prefix_runs[starts]) / (ends - starts)
         
-        return rolling_rates
+        return [
+            {"over": i + 1, "run_rate": round(rate, 2)}
+            for i, rate in enumerate(rates.tolist())
+        ]
 
 
 # =============================================================================
@@ -251,114 +228,447 @@ class OverAnalyzer:
 # =============================================================================
 
 class BSTNode:
-    def __init__(self, player, runs):
+    def __init__(self, player, runs, seq=0):
         self.player = player
         self.runs = runs
+        self.seq = seq
         self.left = None
         self.right = None
+        # AVL height and number of nodes in this subtree
+        self.height = 1
+        self.size = 1
+
+    @property
+    def key(self):
+        return (self.runs, self.seq)
+
+
+def _height(node):
+    return node.height if node else 0
+
+
+def _size(node):
+    return node.size if node else 0
+
+
+def _refresh(node):
+    node.height = 1 + max(_height(node.left), _height(node.right))
+    node.size = 1 + _size(node.left) + _size(node.right)
+
+
+def _rotate_right(node):
+    top = node.left
+    node.left = top.right
+    top.right = node
+    _refresh(node)
+    _refresh(top)
+    return top
+
+
+def _rotate_left(node):
+    top = node.right
+    node.right = top.left
+    top.left = node
+    _refresh(node)
+    _refresh(top)
+    return top
+
+
+def _rebalance(node):
+    """Restore the AVL invariant at node after one insert/delete below it"""
+    _refresh(node)
+    balance = _height(node.left) - _height(node.right)
+    if balance > 1:
+        if _height(node.left.left) < _height(node.left.right):
+            node.left = _rotate_left(node.left)
+        return _rotate_right(node)
+    if balance < -1:
+        if _height(node.right.right) < _height(node.right.left):
+            node.right = _rotate_right(node.right)
+        return _rotate_left(node)
+    return node
 
 
 class PlayerStatsBST:
-    """BST to maintain players sorted by runs with O(log n) operations"""
+    """
+    AVL tree of players sorted by runs, augmented with subtree sizes
+    - nodes are keyed by (runs, seq), seq counting insertions, so players
+      on equal runs keep insertion order; height stays O(log n) whatever
+      the insertion order
+    - insert / delete / update_score / rank / kth / count_in_range: O(log n)
+    - find_first_above_threshold: O(log n + matches)
+    - a player is held once: inserting a known player updates their runs
+    """
     
     def __init__(self):
         self.root = None
+        self.keys = {}
+        self.inserted = 0
+
+    def __len__(self):
+        return _size(self.root)
+
+    def __contains__(self, player):
+        return player in self.keys
     
     def insert(self, player, runs):
-        """Insert player into BST"""
-        if not self.root:
-            self.root = BSTNode(player, runs)
-        else:
-            self._insert_recursive(self.root, player, runs)
+        """Insert player into BST (or move them to their new runs)"""
+        if player in self.keys:
+            self.update_score(player, runs)
+            return
+        self._add(BSTNode(player, runs, self.inserted))
+        self.inserted += 1
+
+    def _add(self, new):
+        self.root = self._insert_recursive(self.root, new)
+        self.keys[new.player] = new.key
     
-    def _insert_recursive(self, node, player, runs):
-        if runs < node.runs:
-            if node.left is None:
-                node.left = BSTNode(player, runs)
-            else:
-                self._insert_recursive(node.left, player, runs)
+    def _insert_recursive(self, node, new):
+        if node is None:
+            return new
+        if new.key < node.key:
+            node.left = self._insert_recursive(node.left, new)
+        else:
+            node.right = self._insert_recursive(node.right, new)
+        return _rebalance(node)
+
+    def delete(self, player):
+        """Remove player; returns False when they are not in the tree"""
+        key = self.keys.pop(player, None)
+        if key is None:
+            return False
+        self.root = self._delete_recursive(self.root, key)
+        return True
+
+    def _delete_recursive(self, node, key):
+        if key < node.key:
+            node.left = self._delete_recursive(node.left, key)
+        elif key > node.key:
+            node.right = self._delete_recursive(node.right, key)
         else:
+            if node.left is None:
+                return node.right
             if node.right is None:
-                node.right = BSTNode(player, runs)
+                return node.left
+            # replace with the in-order successor
+            successor = node.right
+            while successor.left:
+                successor = successor.left
+            node.right = self._delete_recursive(node.right, successor.key)
+            successor.left, successor.right = node.left, node.right
+            node = successor
+        return _rebalance(node)
+
+    def update_score(self, player, runs):
+        """New runs for a known player (e.g. a live score change), keeping their tie order"""
+        _, seq = self.keys[player]
+        self.delete(player)
+        self._add(BSTNode(player, runs, seq))
+
+    def _count_below(self, key):
+        """Number of players whose (runs, seq) key is below key"""
+        count = 0
+        node = self.root
+        while node:
+            if node.key < key:
+                count += _size(node.left) + 1
+                node = node.right
             else:
-                self._insert_recursive(node.right, player, runs)
+                node = node.left
+        return count
+
+    def _select(self, index):
+        """Node at 0-based in-order (ascending) position index"""
+        node = self.root
+        while node:
+            left = _size(node.left)
+            if index < left:
+                node = node.left
+            elif index == left:
+                return node
+            else:
+                index -= left + 1
+                node = node.right
+        raise IndexError(index)
+
+    def count_in_range(self, low, high):
+        """Players with low <= runs <= high"""
+        if low > high:
+            return 0
+        return self._count_below((high, float('inf'))) - self._count_below((low, float('-inf')))
+
+    def rank(self, player):
+        """
+        1-based position of player, most runs first; equal runs rank in
+        insertion order
+        """
+        runs, seq = self.keys[player]
+        above = len(self) - self._count_below((runs, float('inf')))
+        tied_before = self._count_below((runs, seq)) - self._count_below((runs, float('-inf')))
+        return above + tied_before + 1
+
+    def kth(self, k):
+        """The k-th best player (1-based, same order as rank) as {"player", "runs"}"""
+        n = len(self)
+        if not 1 <= k <= n:
+            raise IndexError(k)
+        runs = self._select(n - k).runs
+        group_start = self._count_below((runs, float('-inf')))
+        group_end = self._count_below((runs, float('inf')))
+        node = self._select(group_start + k - 1 - (n - group_end))
+        return {"player": node.player, "runs": node.runs}
     
     def find_first_above_threshold(self, threshold):
-        """Binary search for first player with >= threshold runs"""
+        """Players with >= threshold runs, ascending, found without visiting the ones below"""
         result = []
-        self._find_above_threshold(self.root, threshold, result)
+        stack = []
+        node = self.root
+        while stack or node:
+            if node:
+                # left subtrees below the threshold are skipped entirely
+                if node.runs >= threshold:
+                    stack.append(node)
+                    node = node.left
+                else:
+                    node = node.right
+            else:
+                node = stack.pop()
+                result.append({"player": node.player, "runs": node.runs})
+                node = node.right
         return result
     
-    def _find_above_threshold(self, node, threshold, result):
-        if not node:
-            return
-        
-        if node.runs >= threshold:
-            self._find_above_threshold(node.left, threshold, result)
-            result.append({"player": node.player, "runs": node.runs})
-            self._find_above_threshold(node.right, threshold, result)
-        else:
-            self._find_above_threshold(node.right, threshold, result)
-    
     def inorder_traversal(self):
         """Return players in sorted order by runs"""
         result = []
-        self._inorder(self.root, result)
+        stack = []
+        node = self.root
+        while stack or node:
+            if node:
+                stack.append(node)
+                node = node.left
+            else:
+                node = stack.pop()
+                result.append({"player": node.player, "runs": node.runs})
+                node = node.right
         return result
-    
-    def _inorder(self, node, result):
-        if node:
-            self._inorder(node.left, result)
-            result.append({"player": node.player, "runs": node.runs})
-            self._inorder(node.right, result)
 
 
 # =============================================================================
 # 4. TRIE FOR PLAYER NAME SEARCH
 # =============================================================================
 
+# Completions cached per trie node
+TRIE_TOP_K = 10
+
+
+def name_keys(name):
+    """
+    Search keys of a player name: the lowercased name from each token on,
+    so "Suryakumar Yadav" is found by "sur..." and by "yad..."
+    """
+    tokens = name.lower().split()
+    return [" ".join(tokens[i:]) for i in range(len(tokens))]
+
+
 class TrieNode:
-    def __init__(self):
+    """
+    Radix trie node: label is the edge text leading here, children are
+    keyed by the first character of their label
+    - names: players whose key ends at this node
+    - top: the best (-score, name) completions in this subtree, best first
+    """
+    __slots__ = ("label", "children", "names", "top")
+
+    def __init__(self, label=""):
+        self.label = label
         self.children = {}
-        self.is_end = False
-        self.player_name = None
+        self.names = set()
+        self.top = []
+
+
+def _common_prefix(a, b):
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
 
 
 class PlayerTrie:
-    """Trie for efficient player name autocomplete and search"""
-    
-    def __init__(self):
+    """
+    Compressed (radix) trie for player name autocomplete and search
+    - every name is indexed under each of its tokens (surname search)
+    - each node caches its top k completions ranked by score (e.g. runs or
+      popularity), ties by name, so search(prefix, k) for k <= top_k is a
+      walk of the prefix and a slice: O(len(prefix) + k)
+    - search(prefix) without k returns every match, ranked the same way
+    - inserting a known name updates its score
+    """
+
+    def __init__(self, top_k=TRIE_TOP_K):
         self.root = TrieNode()
-    
-    def insert(self, name):
-        """Insert player name into trie"""
+        self.top_k = top_k
+        self.scores = {}
+
+    def __len__(self):
+        return len(self.scores)
+
+    def __contains__(self, name):
+        return name in self.scores
+
+    def insert(self, name, score=0):
+        """Insert player name into trie (or set the score of a known one)"""
+        old = self.scores.get(name)
+        if old == score:
+            return
+        self.scores[name] = score
+        entry = (-score, name)
+        for key in name_keys(name):
+            path = self._insert_key(key, name)
+            if old is None or score > old:
+                # Better than before: it can only move up in every cache
+                for node in path:
+                    self._offer(node, entry)
+            else:
+                # Worse: a name below the cut may now beat it, rebuild
+                for node in reversed(path):
+                    self._rebuild(node)
+
+    def _insert_key(self, key, name):
+        """Add key -> name, splitting edges as needed; returns the root-to-end path"""
         node = self.root
-        for char in name.lower():
-            if char not in node.children:
-                node.children[char] = TrieNode()
-            node = node.children[char]
-        node.is_end = True
-        node.player_name = name
-    
-    def search(self, prefix):
-        """Find all players matching prefix"""
+        path = [node]
+        rest = key
+        while rest:
+            child = node.children.get(rest[0])
+            if child is None:
+                child = node.children[rest[0]] = TrieNode(rest)
+                path.append(child)
+                rest = ""
+                break
+            common = _common_prefix(rest, child.label)
+            if common < len(child.label):
+                # Split the edge: node -> mid (common part) -> child
+                mid = TrieNode(child.label[:common])
+                child.label = child.label[common:]
+                mid.children[child.label[0]] = child
+                mid.top = list(child.top)
+                node.children[rest[0]] = mid
+                child = mid
+            node = child
+            path.append(node)
+            rest = rest[common:]
+        path[-1].names.add(name)
+        return path
+
+    def _offer(self, node, entry):
+        """Put entry in node.top if it makes the cut"""
+        top = node.top
+        name = entry[1]
+        for i, (_, other) in enumerate(top):
+            if other == name:
+                del top[i]
+                break
+        if len(top) < self.top_k or entry < top[-1]:
+            i = len(top)
+            while i > 0 and entry < top[i - 1]:
+                i -= 1
+            top.insert(i, entry)
+            del top[self.top_k:]
+
+    def _rebuild(self, node):
+        """node.top from its own names and its children's caches"""
+        scores = self.scores
+        own = sorted((-scores[name], name) for name in node.names)
+        merged = heapq.merge(own, *(child.top for child in node.children.values()))
+        top = []
+        seen = set()
+        for entry in merged:
+            if entry[1] not in seen:
+                seen.add(entry[1])
+                top.append(entry)
+                if len(top) == self.top_k:
+                    break
+        node.top = top
+
+    def _find(self, prefix):
+        """Node whose subtree holds every key starting with prefix, or None"""
         node = self.root
-        for char in prefix.lower():
-            if char not in node.children:
-                return []
-            node = node.children[char]
-        
-        return self._collect_names(node)
-    
+        rest = prefix.lower()
+        while rest:
+            child = node.children.get(rest[0])
+            if child is None:
+                return None
+            label = child.label
+            if rest.startswith(label):
+                rest = rest[len(label):]
+            elif label.startswith(rest):
+                rest = ""
+            else:
+                return None
+            node = child
+        return node
+
+    def search(self, prefix, k=None):
+        """Players with a name token starting with prefix, best score first (k best when given)"""
+        node = self._find(prefix)
+        if node is None:
+            return []
+        if k is not None and k <= self.top_k:
+            return [name for _, name in node.top[:k]]
+        return [name for _, name in sorted((-self.scores[name], name) for name in self._collect_names(node))[:k]]
+
+    def fuzzy_search(self, prefix, k=None, max_edits=1):
+        """
+        [(name, edits)] for players with a name token starting with a string
+        within max_edits (Levenshtein) of prefix, fewest edits first, then
+        best score
+        - walks the trie carrying one edit-distance row per character and
+          drops branches whose row minimum exceeds max_edits
+        - a node reached within max_edits matches its whole subtree, so with
+          k <= top_k its cached completions are used as they are
+        """
+        prefix = prefix.lower()
+        cached = k is not None and k <= self.top_k
+        best = {}
+
+        def take(node, edits):
+            entries = node.top if cached else [(-self.scores[name], name) for name in self._collect_names(node)]
+            for _, name in entries:
+                if best.get(name, max_edits + 1) > edits:
+                    best[name] = edits
+
+        first = list(range(len(prefix) + 1))
+        if first[-1] <= max_edits:
+            take(self.root, first[-1])
+        stack = [(child, first) for child in self.root.children.values()]
+        while stack:
+            node, row = stack.pop()
+            matched = None
+            for char in node.label:
+                prev, row = row, [row[0] + 1]
+                for j in range(1, len(prefix) + 1):
+                    row.append(min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + (prefix[j - 1] != char)))
+                if row[-1] <= max_edits and (matched is None or row[-1] < matched):
+                    matched = row[-1]
+                if min(row) > max_edits:
+                    break
+            if matched is not None:
+                take(node, matched)
+            if min(row) <= max_edits:
+                stack.extend((child, row) for child in node.children.values())
+
+        ranked = sorted((edits, -self.scores[name], name) for name, edits in best.items())
+        return [(name, edits) for edits, _, name in ranked[:k]]
+
     def _collect_names(self, node):
         """Collect all names from this node downward"""
-        names = []
-        if node.is_end:
-            names.append(node.player_name)
-        
-        for child in node.children.values():
-            names.extend(self._collect_names(child))
-        
+        names = set()
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            names.update(node.names)
+            stack.extend(node.children.values())
         return names
 
 
@@ -370,35 +680,392 @@ def optimal_bowling_allocation(bowlers, max_overs_per_bowler, total_overs):
     """
     DP: Allocate overs to bowlers to minimize expected runs
     bowlers: list of {"name": str, "economy": float}
+    When the bowlers cannot cover total_overs within max_overs_per_bowler
+    min_expected_runs is None and the allocation is empty
+    - one rolling row of costs, dp[j] = min runs over the bowlers so far for
+      j overs, relaxed for each k as a shifted NumPy minimum (min-plus
+      convolution with k * economy)
+    - take[i][j] = overs given to bowler i in the best plan for j overs; the
+      allocation is one walk back through take, O(n * total_overs) memory
+    - among equally cheap plans the one giving earlier bowlers fewer overs
+      wins
     """
     n = len(bowlers)
-    
-    # dp[i][j] = min runs conceded using first i bowlers for j overs
-    dp = [[float('inf')] * (total_overs + 1) for _ in range(n + 1)]
-    allocation = [[[] for _ in range(total_overs + 1)] for _ in range(n + 1)]
-    
-    dp[0][0] = 0
-    
-    for i in range(1, n + 1):
-        bowler = bowlers[i - 1]
-        for j in range(total_overs + 1):
-            # Try allocating k overs to this bowler
-            for k in range(min(max_overs_per_bowler, j) + 1):
-                if dp[i - 1][j - k] != float('inf'):
-                    cost = dp[i - 1][j - k] + k * bowler["economy"]
-                    if cost < dp[i][j]:
-                        dp[i][j] = cost
-                        allocation[i][j] = allocation[i - 1][j - k] + [{
-                            "bowler": bowler["name"],
-                            "overs": k
-                        }]
-    
+
+    dp = np.full(total_overs + 1, np.inf)
+    dp[0] = 0
+    take = np.zeros((n, total_overs + 1), dtype=np.int16)
+
+    for i, bowler in enumerate(bowlers):
+        row = np.full(total_overs + 1, np.inf)
+        # Try allocating k overs to this bowler
+        for k in range(min(max_overs_per_bowler, total_overs) + 1):
+            cost = dp[:total_overs + 1 - k] + k * bowler["economy"]
+            better = cost < row[k:]
+            np.copyto(row[k:], cost, where=better)
+            np.copyto(take[i, k:], k, where=better)
+        dp = row
+
+    if dp[total_overs] == np.inf:
+        return {"min_expected_runs": None, "allocation": []}
+
+    allocation = []
+    j = total_overs
+    for i in range(n - 1, -1, -1):
+        k = int(take[i, j])
+        allocation.append({"bowler": bowlers[i]["name"], "overs": k})
+        j -= k
+    allocation.reverse()
+    return {
+        "min_expected_runs": round(float(dp[total_overs]), 1),
+        "allocation": allocation
+    }
+
+
+PHASES = ("powerplay", "middle", "death")
+# Overs per phase of the standard formats
+PHASE_OVERS = {20: (6, 9, 5), 50: (10, 30, 10)}
+
+
+def phase_overs(total_overs):
+    """
+    (powerplay, middle, death) overs of an innings: the T20 / ODI split, or
+    the split of the nearer of the two scaled to total_overs
+    """
+    if total_overs in PHASE_OVERS:
+        return PHASE_OVERS[total_overs]
+    base = 20 if total_overs <= 35 else 50
+    powerplay, _, death = PHASE_OVERS[base]
+    powerplay = round(total_overs * powerplay / base)
+    death = round(total_overs * death / base)
+    return (powerplay, total_overs - powerplay - death, death)
+
+
+def phase_economy(bowler):
+    """(powerplay, middle, death) economy of a bowler dict, "economy" for missing phases"""
+    phases = bowler.get("phase_economy") or {}
+    return tuple(phases.get(phase, bowler["economy"]) for phase in PHASES)
+
+
+def optimal_phase_allocation(bowlers, max_overs_per_bowler, total_overs, phases=None):
+    """
+    Bowling allocation with per-phase costs
+    bowlers: list of {"name": str, "economy": float,
+                      "phase_economy": {"powerplay": .., "middle": .., "death": ..}}
+    phases: (powerplay, middle, death) overs, phase_overs(total_overs) by default
+    - dp[p][m][d] = min runs over the bowlers so far bowling p powerplay,
+      m middle and d death overs; each bowler relaxes it once per split
+      (a, b, c) of at most max_overs_per_bowler overs, as a shifted NumPy
+      minimum over the whole 3-D table
+    - back-pointers hold the split index per bowler and state, so the plan
+      is one walk back as in optimal_bowling_allocation
+    """
+    phases = tuple(phases or phase_overs(total_overs))
+    if sum(phases) != total_overs:
+        raise ValueError(f"phase overs {phases} do not add up to {total_overs}")
+    n = len(bowlers)
+    shape = tuple(overs + 1 for overs in phases)
+    caps = [min(max_overs_per_bowler, overs) for overs in phases]
+    splits = [
+        (a, b, c)
+        for a in range(caps[0] + 1)
+        for b in range(caps[1] + 1)
+        for c in range(caps[2] + 1)
+        if a + b + c <= max_overs_per_bowler
+    ]
+
+    dp = np.full(shape, np.inf)
+    dp[0, 0, 0] = 0
+    take = np.zeros((n,) + shape, dtype=np.int32)
+
+    for i, bowler in enumerate(bowlers):
+        economy = phase_economy(bowler)
+        table = np.full(shape, np.inf)
+        for s, (a, b, c) in enumerate(splits):
+            cost = dp[:shape[0] - a, :shape[1] - b, :shape[2] - c] + (a * economy[0] + b * economy[1] + c * economy[2])
+            target = table[a:, b:, c:]
+            better = cost < target
+            np.copyto(target, cost, where=better)
+            np.copyto(take[i, a:, b:, c:], s, where=better)
+        dp = table
+
+    if dp[phases] == np.inf:
+        return {"min_expected_runs": None, "allocation": []}
+
+    allocation = []
+    p, m, d = phases
+    for i in range(n - 1, -1, -1):
+        a, b, c = splits[take[i, p, m, d]]
+        allocation.append({
+            "bowler": bowlers[i]["name"],
+            "overs": a + b + c,
+            "phases": dict(zip(PHASES, (a, b, c)))
+        })
+        p, m, d = p - a, m - b, d - c
+    allocation.reverse()
     return {
-        "min_expected_runs": round(dp[n][total_overs], 1),
-        "allocation": allocation[n][total_overs]
+        "min_expected_runs": round(float(dp[phases]), 1),
+        "allocation": allocation
     }
 
 
+def _fill_cheapest(order, costs, caps, overs):
+    """Cost of `overs` overs given to the cheapest bowlers first, up to caps; inf when they run out"""
+    total = 0
+    for i in order:
+        if overs == 0:
+            return total
+        k = min(caps[i], overs)
+        total += k * costs[i]
+        overs -= k
+    return total if overs == 0 else float('inf')
+
+
+def _cheapest_counts(costs, caps, quota, lengths):
+    """
+    counts[i][ph] of overs per bowler and phase minimizing sum(count * costs[i][ph])
+    with sum_i counts[i][ph] = lengths[ph], sum_ph counts[i][ph] <= quota[i]
+    and counts[i][ph] <= caps[i][ph]; None when impossible
+    Min-cost flow source -> bowler -> phase -> sink by successive shortest
+    paths (Bellman-Ford, the residual graph has negative edges)
+    """
+    n, phases = len(quota), len(lengths)
+    sink = n + phases + 1
+    graph = [[] for _ in range(sink + 1)]
+
+    def edge(u, v, cap, cost):
+        graph[u].append([v, cap, cost, len(graph[v])])
+        graph[v].append([u, 0, -cost, len(graph[u]) - 1])
+
+    for i in range(n):
+        edge(0, i + 1, quota[i], 0)
+        for ph in range(phases):
+            edge(i + 1, n + 1 + ph, caps[i][ph], costs[i][ph])
+    for ph in range(phases):
+        edge(n + 1 + ph, sink, lengths[ph], 0)
+
+    needed = sum(lengths)
+    while needed:
+        dist = [float('inf')] * (sink + 1)
+        via = [None] * (sink + 1)
+        dist[0] = 0
+        for _ in range(sink):
+            changed = False
+            for u in range(sink + 1):
+                if dist[u] == float('inf'):
+                    continue
+                for k, (v, cap, cost, _) in enumerate(graph[u]):
+                    if cap > 0 and dist[u] + cost < dist[v] - 1e-9:
+                        dist[v] = dist[u] + cost
+                        via[v] = (u, k)
+                        changed = True
+            if not changed:
+                break
+        if via[sink] is None:
+            return None
+        push, v = needed, sink
+        while v != 0:
+            u, k = via[v]
+            push = min(push, graph[u][k][1])
+            v = u
+        v = sink
+        while v != 0:
+            u, k = via[v]
+            e = graph[u][k]
+            e[1] -= push
+            graph[v][e[3]][1] += push
+            v = u
+        needed -= push
+
+    counts = [[0] * phases for _ in range(n)]
+    for i in range(n):
+        for v, cap, _, rev in graph[i + 1]:
+            if n < v <= n + phases:
+                counts[i][v - n - 1] = graph[v][rev][1]
+    return counts
+
+
+def _arrangeable(left, overs, prev):
+    """Can bowlers with `left` overs each fill `overs` overs, none twice in a row, after prev?"""
+    return max(left, default=0) <= (overs + 1) // 2 and (prev < 0 or left[prev] <= overs // 2)
+
+
+def _arrange(counts, lengths, prev):
+    """
+    Order for per-phase counts (phases one after another, nobody bowling
+    consecutive overs, the first over not bowled by prev), or None
+    Within a phase the bowler with most overs left goes first; _arrangeable
+    is exact for a single phase, so only a phase's last over can need
+    another choice
+    """
+    segments = [([counts[i][ph] for i in range(len(counts))], overs) for ph, overs in enumerate(lengths) if overs]
+    order = []
+    failed = set()
+
+    def place(seg, pos, prev):
+        if seg == len(segments):
+            return True
+        left, overs = segments[seg]
+        if pos == overs:
+            return seg + 1 == len(segments) or (
+                _arrangeable(segments[seg + 1][0], segments[seg + 1][1], prev) and place(seg + 1, 0, prev))
+        key = (seg, pos, prev, tuple(left))
+        if key in failed:
+            return False
+        for i in sorted(range(len(left)), key=lambda i: -left[i]):
+            if i == prev or left[i] == 0:
+                continue
+            left[i] -= 1
+            if _arrangeable(left, overs - pos - 1, i):
+                order.append(i)
+                if place(seg, pos + 1, i):
+                    return True
+                order.pop()
+            left[i] += 1
+        failed.add(key)
+        return False
+
+    if segments and not _arrangeable(segments[0][0], segments[0][1], prev):
+        return None
+    return order if place(0, 0, prev) else None
+
+
+def optimal_bowling_plan(bowlers, max_overs_per_bowler, total_overs, phases=None, start_over=0, last_bowler=None):
+    """
+    Over-by-over bowling plan minimizing expected runs from per-phase economies
+    bowlers: list of {"name": str, "economy": float, "phase_economy": {..},
+                      "overs_left": int (default max_overs_per_bowler)}
+    start_over / last_bowler: re-plan the rest of an innings after start_over
+    overs, the last of them bowled by last_bowler
+    - no bowler bowls two overs in a row or more than their overs left
+    - cost only depends on who bowls in which phase, so the cheapest
+      per-phase over counts are solved first (a min-cost flow that keeps
+      the no-consecutive-overs caps, (L + 1) // 2 of a phase's L overs) and
+      then put in order. That cost is a lower bound, so an order found is
+      optimal.
+    - when the counts cannot be ordered (a rare clash where phases meet)
+      _search_bowling_plan settles it exactly
+    Infeasible plans give min_expected_runs None and an empty plan
+    """
+    phases = tuple(phases or phase_overs(total_overs))
+    if sum(phases) != total_overs:
+        raise ValueError(f"phase overs {phases} do not add up to {total_overs}")
+    names = [bowler["name"] for bowler in bowlers]
+    economy = [phase_economy(bowler) for bowler in bowlers]
+    quota = [max(0, min(bowler.get("overs_left", max_overs_per_bowler), max_overs_per_bowler)) for bowler in bowlers]
+    last = names.index(last_bowler) if last_bowler in names else -1
+
+    # Overs of each phase still to be bowled
+    ends = [sum(phases[:ph + 1]) for ph in range(len(phases))]
+    lengths = [max(0, end - max(start_over, end - overs)) for end, overs in zip(ends, phases)]
+    first = next((ph for ph, overs in enumerate(lengths) if overs), None)
+    caps = [[(overs + 1) // 2 if i != last or ph != first else overs // 2 for ph, overs in enumerate(lengths)]
+            for i in range(len(bowlers))]
+
+    counts = _cheapest_counts(economy, caps, quota, lengths)
+    if counts is None:
+        return {"min_expected_runs": None, "plan": []}
+    order = _arrange(counts, lengths, last)
+    if order is None:
+        order = _search_bowling_plan(economy, quota, phases, start_over, last)
+        if order is None:
+            return {"min_expected_runs": None, "plan": []}
+
+    phase_of = [ph for ph, overs in enumerate(phases) for _ in range(overs)]
+    plan = []
+    cost = 0
+    for over, i in enumerate(order, start_over):
+        cost += economy[i][phase_of[over]]
+        plan.append({"over": over + 1, "bowler": names[i], "phase": PHASES[phase_of[over]]})
+    return {"min_expected_runs": round(cost, 1), "plan": plan}
+
+
+def _search_bowling_plan(economy, quota, phases, start_over, last):
+    """
+    Bowler indices for overs start_over.. of the cheapest valid plan, None when there is none
+    - label-setting (A*) search over (over, last bowler, overs-left vector):
+      labels are expanded cheapest first by cost so far plus a lower bound
+      on the rest, and a state is only kept with its cheapest label
+    - the bound is the larger of two relaxations that keep the
+      no-consecutive-overs caps: every phase filled on its own, and all the
+      remaining overs at each bowler's cheapest remaining phase. It is
+      infinite exactly when no valid order exists, so dead states are never
+      expanded
+    - bowlers with the same economies and overs left are interchangeable,
+      only one of them is tried per step
+    """
+    n = len(economy)
+    total_overs = sum(phases)
+    phase_of = [ph for ph, overs in enumerate(phases) for _ in range(overs)]
+    phase_end = [sum(phases[:ph + 1]) for ph in range(len(phases))]
+    # Bowlers cheapest first, per phase and per first remaining phase
+    phase_cost = [[economy[i][ph] for i in range(n)] for ph in range(len(phases))]
+    phase_order = [sorted(range(n), key=costs.__getitem__) for costs in phase_cost]
+    rest_cost = [[min(economy[i][ph:]) for i in range(n)] for ph in range(len(phases))]
+    rest_order = [sorted(range(n), key=costs.__getitem__) for costs in rest_cost]
+
+    def bound(t, last, rem):
+        overs = total_overs - t
+        if overs == 0:
+            return 0
+        first = phase_of[t]
+        caps = [min(r, (overs + 1) // 2) for r in rem]
+        if last >= 0:
+            caps[last] = min(rem[last], overs // 2)
+        whole = _fill_cheapest(rest_order[first], rest_cost[first], caps, overs)
+        split = 0
+        for ph in range(first, len(phases)):
+            overs = phase_end[ph] - max(t, phase_end[ph] - phases[ph])
+            if overs == 0:
+                continue
+            caps = [min(r, (overs + 1) // 2) for r in rem]
+            if last >= 0 and ph == first:
+                caps[last] = min(rem[last], overs // 2)
+            split += _fill_cheapest(phase_order[ph], phase_cost[ph], caps, overs)
+        return max(whole, split)
+
+    start = (start_over, last, tuple(quota))
+    h = bound(*start)
+    if h == float('inf'):
+        return None
+
+    # labels[id] = (parent id, bowler); heap entries break f ties by depth
+    labels = [(-1, last)]
+    best = {start: 0}
+    heap = [(h, -start_over, 0, 0, start)]
+    while heap:
+        _, _, label, g, state = heapq.heappop(heap)
+        t, last, rem = state
+        if g > best[state]:
+            continue
+        if t == total_overs:
+            order = []
+            while label > 0:
+                label, bowler = labels[label]
+                order.append(bowler)
+            order.reverse()
+            return order
+
+        ph = phase_of[t]
+        tried = set()
+        for i in range(n):
+            if i == last or rem[i] == 0 or (economy[i], rem[i]) in tried:
+                continue
+            tried.add((economy[i], rem[i]))
+            child_rem = rem[:i] + (rem[i] - 1,) + rem[i + 1:]
+            child = (t + 1, i, child_rem)
+            child_g = g + phase_cost[ph][i]
+            if child in best and best[child] <= child_g:
+                continue
+            h = bound(t + 1, i, child_rem)
+            if h == float('inf'):
+                continue
+            best[child] = child_g
+            labels.append((label, i))
+            heapq.heappush(heap, (child_g + h, -(t + 1), len(labels) - 1, child_g, child))
+    return None
+
+
 # =============================================================================
 # 6. HASHING - PATTERN DETECTION
 # =============================================================================
@@ -429,22 +1096,22 @@ def detect_scoring_patterns(runs, pattern_length=4):
 def detect_duplicate_overs(overs_head):
     """
     Hash table to detect duplicate over performances
+    Takes an OverTable or the head of an OverNode linked list
     """
+    table = OverTable.coerce(overs_head)
     over_hash = {}
     duplicates = []
     
-    curr = overs_head
-    while curr:
-        key = (curr.runs, curr.wickets)
+    for over_num, runs, wickets in zip(table.over_num.tolist(), table.runs.tolist(), table.wickets.tolist()):
+        key = (runs, wickets)
         if key in over_hash:
             duplicates.append({
-                "pattern": f"{curr.runs} runs, {curr.wickets} wickets",
-                "overs": over_hash[key] + [curr.over_num]
+                "pattern": f"{runs} runs, {wickets} wickets",
+                "overs": over_hash[key] + [over_num]
             })
-            over_hash[key].append(curr.over_num)
+            over_hash[key].append(over_num)
         else:
-            over_hash[key] = [curr.over_num]
-        curr = curr.next
+            over_hash[key] = [over_num]
     
     return duplicates
 
@@ -518,37 +1185,127 @@ def cluster_batters_by_common_dismissals(G):
 # =============================================================================
 
 class BowlerScheduler:
-    """Priority queue based bowler scheduling"""
-    
-    def __init__(self, bowlers):
+    """
+    Priority queue based bowler scheduling, kept for a whole innings
+    - priority = wickets * 10 - economy (higher first, ties by name)
+    - indexed heap with lazy invalidation: every bowler has a version, an
+      update pushes a fresh (-priority, name, version) entry and older
+      entries are dropped when they surface; the heap is rebuilt once stale
+      entries outnumber live ones
+    - record_over(bowler, runs, wickets): O(log n), economy is recomputed
+      from the running figures
+    - get_next_bowler(): best bowler with overs left who is not cooling
+      down (the last `cooldown` bowlers to bowl, 1 = no consecutive overs,
+      see rest);
+      O(log n) amortized and the bowler stays in the queue
+    """
+
+    def __init__(self, bowlers, max_overs_per_bowler=4, cooldown=1, last_bowler=None):
         """
-        bowlers: [{"name": str, "economy": float, "wickets": int, "overs_left": int}]
+        bowlers: [{"name": str, "economy": float, "wickets": int, "overs_left": int}],
+        optionally with "runs" and "overs" bowled so economy can be kept up
+        to date (otherwise it starts from the given economy)
         """
+        self.max_overs_per_bowler = max_overs_per_bowler
+        self.figures = {}
+        self.versions = {}
         self.heap = []
+        self.live = 0
+        self.recent = deque(maxlen=cooldown)
         for b in bowlers:
-            priority = self._calculate_priority(b)
-            heapq.heappush(self.heap, (-priority, b["name"], b))
-    
+            self.figures[b["name"]] = {
+                "runs": b.get("runs", 0),
+                "overs": b.get("overs", 0),
+                "wickets": b["wickets"],
+                "overs_left": b["overs_left"],
+                "economy": b["economy"]
+            }
+            self.versions[b["name"]] = 0
+            if b["overs_left"] > 0:
+                self.heap.append(self._entry(b["name"]))
+                self.live += 1
+        heapq.heapify(self.heap)
+        if last_bowler is not None:
+            self.rest(last_bowler)
+
+    @classmethod
+    def from_bowler_info(cls, bowler_info, max_overs_per_bowler=4, cooldown=1, last_bowler=None):
+        """Scheduler over {'bowler': {'overs': [...], 'runs', 'wickets'}} figures"""
+        bowlers = []
+        for name, stats in bowler_info.items():
+            overs = len(stats["overs"])
+            bowlers.append({
+                "name": name,
+                "economy": stats["runs"] / overs if overs > 0 else 0,
+                "wickets": stats["wickets"],
+                "overs_left": max_overs_per_bowler - overs,
+                "runs": stats["runs"],
+                "overs": overs
+            })
+        return cls(bowlers, max_overs_per_bowler, cooldown, last_bowler)
+
     def _calculate_priority(self, bowler):
         """Higher is better - based on economy and wickets"""
         return bowler["wickets"] * 10 - bowler["economy"]
-    
+
+    def _entry(self, name):
+        return (-self._calculate_priority(self.figures[name]), name, self.versions[name])
+
+    def row(self, name):
+        f = self.figures[name]
+        return {"name": name, "economy": f["economy"], "wickets": f["wickets"], "overs_left": f["overs_left"]}
+
     def get_next_bowler(self):
-        """Get highest priority bowler"""
-        if not self.heap:
-            return None
-        
-        _, name, bowler = heapq.heappop(self.heap)
-        return bowler
-    
+        """Get highest priority bowler who may bowl the next over (None when nobody can)"""
+        heap = self.heap
+        resting = []
+        best = None
+        while heap:
+            _, name, version = heap[0]
+            if version != self.versions[name]:
+                heapq.heappop(heap)
+            elif name in self.recent:
+                resting.append(heapq.heappop(heap))
+            else:
+                best = name
+                break
+        for entry in resting:
+            heapq.heappush(heap, entry)
+        return self.row(best) if best is not None else None
+
+    def record_over(self, bowler, runs, wickets):
+        """Add an over bowled by bowler (new bowlers join with max_overs_per_bowler)"""
+        f = self.figures.get(bowler)
+        if f is None:
+            f = self.figures[bowler] = {"runs": 0, "overs": 0, "wickets": 0,
+                                        "overs_left": self.max_overs_per_bowler, "economy": 0}
+            self.versions[bowler] = 0
+            queued = False
+        else:
+            queued = f["overs_left"] > 0
+        f["runs"] += runs
+        f["overs"] += 1
+        f["wickets"] += wickets
+        f["overs_left"] -= 1
+        f["economy"] = f["runs"] / f["overs"]
+        self.versions[bowler] += 1
+        if f["overs_left"] > 0:
+            heapq.heappush(self.heap, self._entry(bowler))
+        self.live += (f["overs_left"] > 0) - queued
+        self.rest(bowler)
+
+        if len(self.heap) > 2 * self.live + 8:
+            self.heap = [self._entry(name) for name, f in self.figures.items() if f["overs_left"] > 0]
+            heapq.heapify(self.heap)
+
+    def rest(self, bowler):
+        """Mark bowler as the latest to bowl (e.g. when their over starts)"""
+        if not self.recent or self.recent[-1] != bowler:
+            self.recent.append(bowler)
+
     def return_bowler(self, bowler, runs_conceded, wickets_taken):
-        """Update and return bowler to queue"""
-        bowler["overs_left"] -= 1
-        if bowler["overs_left"] > 0:
-            # Update stats
-            bowler["wickets"] += wickets_taken
-            priority = self._calculate_priority(bowler)
-            heapq.heappush(self.heap, (-priority, bowler["name"], bowler))
+        """Update and return bowler to queue (record_over for a bowler row)"""
+        self.record_over(bowler["name"], runs_conceded, wickets_taken)
 
 
 # =============================================================================
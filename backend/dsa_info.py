@@ -1,4 +1,8 @@
-from collections import deque, defaultdict
+import numpy as np
+
+from delivery_log import EXTRA_NAMES, EXTRA_WD
+from innings import InningsState
+from over_table import OverTable
 
 class OverNode:
     def __init__(self, over_num, runs, wickets):
@@ -7,145 +11,94 @@ class OverNode:
         self.wickets = wickets
         self.next = None
 
-def cricket_analysis(runs, bowlers, batters):
-    batter_queue = deque(batters)
-    
-    # batter & bowler stats
-    batter_info = defaultdict(lambda: {"runs": 0, "balls": 0, "4s": 0, "6s": 0})
-    bowler_info = defaultdict(lambda: {"overs": [], "runs": 0, "wickets": 0})
-    extras = {"WD": 0, "NB": 0, "LB": 0, "B": 0}
-    
-    # initialize with two batters
-    striker = batter_queue.popleft()
-    non_striker = batter_queue.popleft()
-    
+def cricket_analysis(runs, bowlers, batters, state=None, as_table=False):
+    """
+    Scorecard of one innings read from an InningsState
+    (replayed from runs when no state is passed)
+    Returns batter_info, bowler_info, extras and the head of the OverNode list,
+    or an OverTable in its place when as_table is set
+    """
+    if state is None:
+        state = InningsState.from_deliveries(runs, bowlers, batters)
+
+    batter_info = {name: dict(stats) for name, stats in state.batter_info.items()}
+    bowler_info = {name: {**stats, "overs": list(stats["overs"])} for name, stats in state.bowler_info.items()}
+    extras = dict(state.extras)
+
+    rows = state.over_rows()
+    return batter_info, bowler_info, extras, OverTable(rows) if as_table else link_overs(rows)
+
+def link_overs(rows):
+    """Chain (over_num, runs, wickets) rows into an OverNode list, returns its head"""
     head = None
     prev = None
-    ball_count = 0
-    over_num = 1
-    over_runs = 0
-    over_wkts = 0
-    
-    i = 0
-    while i < len(runs):
-        run = str(runs[i]).upper()
-        bowler = bowlers[(over_num - 1) % len(bowlers)]
-
-        legal_delivery = False
-        runs_scored = 0
-
-        if ball_count == 0 :
-            # At start of each over
-            bowler = bowlers[(over_num - 1) % len(bowlers)]
-            if over_num not in bowler_info[bowler]["overs"]:
-                bowler_info[bowler]["overs"].append(over_num)
-
-
-        if run == "W":  # Wicket
-            batter_info[striker]["balls"] += 1
-            bowler_info[bowler]["wickets"] += 1
-            over_wkts += 1
-            ball_count += 1
-            legal_delivery = True
-
-            if batter_queue:
-                striker = batter_queue.popleft()
-            else:
-                break
-
-        elif run.startswith("WD"):  # Wide
-            extras["WD"] += 1
-            bowler_info[bowler]["runs"] += 1
-            over_runs += 1
-            if len(run) > 2:
-                addl = int(run[2:])
-                extras["WD"] += addl
-                bowler_info[bowler]["runs"] += addl
-                over_runs += addl
-            # no ball_count increment
-
-        elif run.startswith("NB"):  # No-ball
-            extras["NB"] += 1
-            bowler_info[bowler]["runs"] += 1
-            over_runs += 1
-            if len(run) > 2:
-                runs_scored = int(run[2:])
-                batter_info[striker]["runs"] += runs_scored
-                if runs_scored == 4:
-                    batter_info[striker]["4s"] += 1
-                elif runs_scored == 6:
-                    batter_info[striker]["6s"] += 1
-                bowler_info[bowler]["runs"] += runs_scored
-                over_runs += runs_scored
-                if runs_scored % 2 == 1:
-                    striker, non_striker = non_striker, striker
-            # no ball_count increment
-
-        elif run.startswith("LB"):  # Leg Bye
-            runs_scored = int(run[2:]) if len(run) > 2 else 1
-            extras["LB"] += runs_scored
-            bowler_info[bowler]["runs"] += runs_scored
-            over_runs += runs_scored
-            batter_info[striker]["balls"] += 1
-            ball_count += 1
-            legal_delivery = True
-            if runs_scored % 2 == 1:
-                striker, non_striker = non_striker, striker
-
-        elif run.startswith("B"):  # Bye
-            runs_scored = int(run[1:]) if len(run) > 1 else 1
-            extras["B"] += runs_scored
-            bowler_info[bowler]["runs"] += runs_scored
-            over_runs += runs_scored
-            batter_info[striker]["balls"] += 1
-            ball_count += 1
-            legal_delivery = True
-            if runs_scored % 2 == 1:
-                striker, non_striker = non_striker, striker
-
-        else:  # Normal run
-            runs_scored = int(run)
-            batter_info[striker]["runs"] += runs_scored
-            batter_info[striker]["balls"] += 1
-            if runs_scored == 4:
-                batter_info[striker]["4s"] += 1
-            elif runs_scored == 6:
-                batter_info[striker]["6s"] += 1
-            bowler_info[bowler]["runs"] += runs_scored
-            over_runs += runs_scored
-            ball_count += 1
-            legal_delivery = True
-            if runs_scored % 2 == 1:
-                striker, non_striker = non_striker, striker
-
-        # End of over: every 6 legal balls
-        if legal_delivery and ball_count == 6:
-            node = OverNode(over_num, over_runs, over_wkts)
-            if head is None:
-                head = node
-            else:
-                prev.next = node
-            prev = node
-
-            over_num += 1
-            ball_count = 0
-            over_runs = 0
-            over_wkts = 0
-            striker, non_striker = non_striker, striker
-
-        i += 1
-
-    # Last incomplete over
-    if ball_count > 0:
+    for over_num, over_runs, over_wkts in rows:
         node = OverNode(over_num, over_runs, over_wkts)
         if head is None:
             head = node
         else:
             prev.next = node
-
-
-    
-    return dict(batter_info), dict(bowler_info), extras, head
+        prev = node
+    return head
+
+def cricket_analysis_log(log, as_table=False):
+    """
+    Vectorized cricket_analysis over a DeliveryLog: same return values,
+    computed with bincount / reduceat over the integer columns instead of a
+    per-ball loop. A concatenated log (DeliveryLog.concat) gives season
+    totals; its over rows and bowler overs are listed per innings.
+    """
+    n = len(log)
+    total = log.total_runs()
+    not_wide = log.extra_type != EXTRA_WD
+
+    # batters: only deliveries the striker is credited with (no wides)
+    credited = not_wide & ((log.legal == 1) | (log.bat_runs > 0))
+    strikers = log.striker[credited]
+    nb = len(log.batters)
+    bat_runs = np.bincount(strikers, weights=log.bat_runs[credited], minlength=nb).astype(int)
+    bat_balls = np.bincount(strikers, weights=log.legal[credited], minlength=nb).astype(int)
+    fours = np.bincount(strikers, weights=log.bat_runs[credited] == 4, minlength=nb).astype(int)
+    sixes = np.bincount(strikers, weights=log.bat_runs[credited] == 6, minlength=nb).astype(int)
+    seen, first = np.unique(strikers, return_index=True)
+    batter_info = {
+        log.batters[i]: {"runs": int(bat_runs[i]), "balls": int(bat_balls[i]), "4s": int(fours[i]), "6s": int(sixes[i])}
+        for i in seen[np.argsort(first, kind="stable")].tolist()
+    }
+
+    # overs: one group per (innings, over), kept once it has a legal ball
+    if n:
+        starts = np.flatnonzero(np.r_[True, (log.over[1:] != log.over[:-1]) | (log.match[1:] != log.match[:-1])])
+    else:
+        starts = np.zeros(0, dtype=int)
+    if len(starts):
+        over_runs = np.add.reduceat(total, starts)
+        over_wkts = np.add.reduceat(log.wicket, starts)
+        over_legal = np.add.reduceat(log.legal, starts)
+    else:
+        over_runs = over_wkts = over_legal = np.zeros(0, dtype=int)
+    rows = [
+        (over_num, runs, wkts)
+        for over_num, runs, wkts, legal in zip(log.over[starts].tolist(), over_runs.tolist(),
+                                               over_wkts.tolist(), over_legal.tolist())
+        if legal
+    ]
+
+    # bowlers: runs conceded include every extra, overs in bowling order
+    nw = len(log.bowlers)
+    bowl_runs = np.bincount(log.bowler, weights=total, minlength=nw).astype(int)
+    bowl_wkts = np.bincount(log.bowler, weights=log.wicket, minlength=nw).astype(int)
+    bowler_info = {}
+    for bowler, over_num in zip(log.bowler[starts].tolist(), log.over[starts].tolist()):
+        name = log.bowlers[bowler]
+        if name not in bowler_info:
+            bowler_info[name] = {"overs": [], "runs": int(bowl_runs[bowler]), "wickets": int(bowl_wkts[bowler])}
+        bowler_info[name]["overs"].append(over_num)
+
+    extra_runs = np.bincount(log.extra_type, weights=log.extra_runs, minlength=len(EXTRA_NAMES)).astype(int)
+    extras = {name: int(extra_runs[code]) for code, name in enumerate(EXTRA_NAMES) if name}
+
+    return batter_info, bowler_info, extras, OverTable(rows) if as_table else link_overs(rows)
 
 
 
@@ -0,0 +1,216 @@
+"""
+Incremental ball-by-ball innings state shared by all analyzers
+One InningsState consumes deliveries through apply(ball) in O(1) and keeps
+batter, bowler, over, partnership, extras and matchup aggregates together
+"""
+
+from collections import namedtuple
+
+EXTRA_TYPES = ("WD", "NB", "LB", "B")
+# most runs a single delivery token may carry (e.g. 3 run plus 4 overthrows)
+MAX_BALL_RUNS = 7
+
+# One processed delivery plus the innings state right after it
+Delivery = namedtuple("Delivery", [
+    "index", "over", "ball", "batter", "bowler", "kind", "bat_runs", "extra_runs",
+    "wicket", "legal", "score", "wickets", "legal_balls", "striker_pos", "non_striker_pos"
+])
+
+
+def parse_delivery(ball):
+    """
+    Tokenize one delivery such as 0, 4, "W", "WD", "WD2", "NB4", "LB1", "B2"
+    Returns (kind, bat_runs, extra_runs, wicket) where kind is None for a
+    ball off the bat, else one of EXTRA_TYPES; ValueError when the token does
+    not parse or its run count is outside 0..MAX_BALL_RUNS
+    """
+    token = str(ball).upper()
+    if token == "W":
+        return None, 0, 0, True
+    for kind in EXTRA_TYPES:
+        if token.startswith(kind):
+            count = token[len(kind):]
+            break
+    else:
+        kind, count = None, token
+    if count and not (count.isdigit() and int(count) <= MAX_BALL_RUNS):
+        raise ValueError(f"cannot parse delivery {ball!r}")
+    n = int(count) if count else None
+    if kind is None:
+        if n is None:
+            raise ValueError(f"cannot parse delivery {ball!r}")
+        return None, n, 0, False
+    if kind == "WD":
+        return "WD", 0, 1 + (n or 0), False
+    if kind == "NB":
+        return "NB", n or 0, 1, False
+    return kind, 0, 1 if n is None else n, False
+
+
+class InningsState:
+    """
+    Running state of one innings
+    - batters: batting order, bowlers: planned bowler for each over (rotates)
+    - batter_info / bowler_info / extras match dsa_info.cricket_analysis
+    - overs: completed (over_num, runs, wickets) rows
+    - partnerships: [{"pair": (incoming, survivor), "runs", "balls"}], newest last
+    - matchups: {(batter, bowler): {"runs", "balls", "wickets"}}
+    - deliveries: Delivery records in order (kept only when record=True)
+    """
+
+    def __init__(self, batters, bowlers, record=True):
+        self.batters = list(batters)
+        self.bowlers = list(bowlers)
+        self.record = record
+        self.balls_seen = 0
+
+        self.striker_pos = 0
+        self.non_striker_pos = 1
+        self.next_pos = 2
+        self.all_out = False
+
+        self.score = 0
+        self.wickets = 0
+        self.legal_balls = 0
+        self.over_num = 1
+        self.ball_in_over = 0
+        self.over_runs = 0
+        self.over_wkts = 0
+
+        self.batter_info = {}
+        self.bowler_info = {}
+        self.extras = {"WD": 0, "NB": 0, "LB": 0, "B": 0}
+        self.overs = []
+        self.partnerships = [self._new_partnership(0, 1)]
+        self.matchups = {}
+        self.deliveries = []
+
+    @classmethod
+    def from_deliveries(cls, runs, bowlers, batters):
+        """Replay a whole list of deliveries"""
+        state = cls(batters, bowlers)
+        state.extend(runs)
+        return state
+
+    def _new_partnership(self, incoming, survivor):
+        return {"pair": (self.batters[incoming], self.batters[survivor]), "runs": 0, "balls": 0}
+
+    def _batter(self, name):
+        if name not in self.batter_info:
+            self.batter_info[name] = {"runs": 0, "balls": 0, "4s": 0, "6s": 0}
+        return self.batter_info[name]
+
+    @property
+    def striker(self):
+        return self.batters[self.striker_pos]
+
+    @property
+    def non_striker(self):
+        return self.batters[self.non_striker_pos]
+
+    @property
+    def current_bowler(self):
+        if not self.bowlers:
+            return None
+        return self.bowlers[(self.over_num - 1) % len(self.bowlers)]
+
+    @property
+    def junior_on_strike(self):
+        """1 when the later of the two batters at the crease is on strike"""
+        return int(self.striker_pos > self.non_striker_pos)
+
+    def current_over(self):
+        """(over_num, runs, wickets) of the over in progress, None before its first legal ball"""
+        if self.ball_in_over == 0:
+            return None
+        return (self.over_num, self.over_runs, self.over_wkts)
+
+    def over_rows(self):
+        """Completed overs plus the over in progress"""
+        current = self.current_over()
+        return self.overs + [current] if current else list(self.overs)
+
+    def extend(self, runs):
+        for ball in runs:
+            self.apply(ball)
+        return self
+
+    def apply(self, ball):
+        """
+        Add one delivery; returns its Delivery record, or None once the
+        side is all out
+        """
+        if self.all_out:
+            return None
+        kind, bat_runs, extra_runs, wicket = parse_delivery(ball)
+        total = bat_runs + extra_runs
+        legal = kind not in ("WD", "NB")
+
+        striker = self.striker
+        bowler = self.current_bowler
+        bowler_stats = self.bowler_info.setdefault(bowler, {"overs": [], "runs": 0, "wickets": 0})
+        if self.ball_in_over == 0 and self.over_num not in bowler_stats["overs"]:
+            bowler_stats["overs"].append(self.over_num)
+        matchup = self.matchups.setdefault((striker, bowler), {"runs": 0, "balls": 0, "wickets": 0})
+        partnership = self.partnerships[-1]
+
+        # batter figures (wides are not faced, no-balls only count bat runs)
+        if kind != "WD" and (legal or bat_runs):
+            stats = self._batter(striker)
+            stats["runs"] += bat_runs
+            if legal:
+                stats["balls"] += 1
+            if bat_runs == 4:
+                stats["4s"] += 1
+            elif bat_runs == 6:
+                stats["6s"] += 1
+        if kind:
+            self.extras[kind] += extra_runs
+        matchup["runs"] += bat_runs
+        bowler_stats["runs"] += total
+        partnership["runs"] += total
+        self.score += total
+        self.over_runs += total
+
+        if legal:
+            matchup["balls"] += 1
+            partnership["balls"] += 1
+            self.legal_balls += 1
+            self.ball_in_over += 1
+        ball_no = self.ball_in_over
+        over_num = self.over_num
+
+        if wicket:
+            matchup["wickets"] += 1
+            bowler_stats["wickets"] += 1
+            self.wickets += 1
+            self.over_wkts += 1
+            if self.next_pos < len(self.batters):
+                survivor = self.non_striker_pos
+                self.striker_pos = self.next_pos
+                self.next_pos += 1
+                self.partnerships.append(self._new_partnership(self.striker_pos, survivor))
+            else:
+                self.all_out = True
+        else:
+            # batters cross on odd runs off the bat or odd byes/leg byes
+            ran = extra_runs if kind in ("LB", "B") else bat_runs
+            if ran % 2 == 1:
+                self.striker_pos, self.non_striker_pos = self.non_striker_pos, self.striker_pos
+
+        # end of over: every 6 legal balls
+        if legal and self.ball_in_over == 6 and not self.all_out:
+            self.overs.append((self.over_num, self.over_runs, self.over_wkts))
+            self.over_num += 1
+            self.ball_in_over = 0
+            self.over_runs = 0
+            self.over_wkts = 0
+            self.striker_pos, self.non_striker_pos = self.non_striker_pos, self.striker_pos
+
+        delivery = Delivery(self.balls_seen, over_num, ball_no, striker, bowler, kind, bat_runs, extra_runs,
+                            wicket, legal, self.score, self.wickets, self.legal_balls,
+                            self.striker_pos, self.non_striker_pos)
+        self.balls_seen += 1
+        if self.record:
+            self.deliveries.append(delivery)
+        return delivery
@@ -0,0 +1,265 @@
+"""
+Live matches fed ball by ball
+A LiveMatch keeps one InningsState per innings; every appended ball is
+applied in O(1) and only the sections it changed are pushed to subscribers
+(new over row, batter and bowler lines, bowling leaderboard, partnership,
+extras, win probability, next bowler after each over). Win tables are only
+read on the event loop; solving one happens on a worker thread.
+"""
+
+import asyncio
+
+from analysis import batter_row, partnership_row
+from cric import BowlingLeaderboard
+from dsa2 import BowlerScheduler
+from innings import InningsState
+from predictor import cached_win_table, table_win_prob
+
+# Events a slow subscriber may fall behind by; past that its queue is
+# replaced by a single fresh snapshot event
+SUBSCRIBER_QUEUE_SIZE = 1024
+
+
+def bowler_row(name, stats):
+    """Bowler line in the shape of the bowlers_* lists"""
+    overs = len(stats["overs"])
+    return {
+        "name": name,
+        "economy": stats["runs"] / overs if overs > 0 else 0,
+        "runs": stats["runs"],
+        "wickets": stats["wickets"],
+        "overs": overs
+    }
+
+
+def over_row(row):
+    over_num, runs, wickets = row
+    return {"over": over_num, "runs": runs, "wickets": wickets}
+
+
+def bowler_scheduler(state, max_overs_per_bowler):
+    """
+    BowlerScheduler over the completed overs of an innings; the bowler of
+    the latest delivery (still bowling mid-over) cools down
+    """
+    bowler_info = state.bowler_info
+    stats = bowler_info.get(state.current_bowler)
+    if stats is not None and state.over_num in stats["overs"]:
+        # the over in progress (maybe only extras so far) is recorded when it ends
+        bowler_info = dict(bowler_info)
+        bowler_info[state.current_bowler] = {"overs": stats["overs"][:-1], "runs": stats["runs"] - state.over_runs,
+                                             "wickets": stats["wickets"] - state.over_wkts}
+    last = state.deliveries[-1].bowler if state.deliveries else None
+    return BowlerScheduler.from_bowler_info(bowler_info, max_overs_per_bowler, last_bowler=last)
+
+
+class LiveMatch:
+    """
+    Running state of a match built from a MatchPayload
+    - states: {"a": InningsState, "b": InningsState}, innings a is the chase
+    - leaderboards: {"a" / "b": BowlingLeaderboard}, updated per ball
+    - schedulers: {"a" / "b": BowlerScheduler}, fed every completed over
+    - apply(innings, ball) adds a delivery and returns the changed sections
+    - subscribe() hands out an asyncio.Queue that receives every change;
+      apply / publish must run on the event loop thread
+    - win_table: (target, WinTable) of the chase once solved. It is solved
+      in __init__ (built off the loop) when the target is known; otherwise
+      apply starts a background solve on a miss and publishes the win
+      probability when it lands.
+    """
+
+    def __init__(self, match):
+        self.match = match
+        self.states = {
+            "a": InningsState(match.innings_a.batters, match.innings_a.bowlers),
+            "b": InningsState(match.innings_b.batters, match.innings_b.bowlers)
+        }
+        self.states["b"].extend(match.innings_b.runs)
+        self.states["a"].extend(match.innings_a.runs)
+        self.leaderboards = {
+            innings: BowlingLeaderboard.from_bowler_info(state.bowler_info) for innings, state in self.states.items()
+        }
+        self.schedulers = {
+            innings: bowler_scheduler(state, match.max_overs_per_bowler) for innings, state in self.states.items()
+        }
+        self.version = 0
+        self.subscribers = set()
+        self.win_table = None
+        self.win_table_task = None
+        if match.batter_bowler_probs and (match.target or self.innings_over("b")):
+            self.solve_win_table(self.target())
+        # held by appenders so concurrent requests apply balls one at a time
+        self.lock = asyncio.Lock()
+
+    def target(self):
+        return self.match.target or self.states["b"].score + 1
+
+    def innings_over(self, innings):
+        """All out, out of overs, or (for the chase) target reached"""
+        state = self.states[innings]
+        if state.all_out or state.legal_balls >= self.match.total_overs * 6:
+            return True
+        return innings == "a" and state.score >= self.target()
+
+    def solve_win_table(self, target):
+        """Solve (or fetch from the table cache) the chase table; blocks, so keep it off the loop"""
+        match = self.match
+        chase = match.innings_a
+        table = cached_win_table(target, match.total_overs, chase.batters, chase.bowlers,
+                                 match.batter_bowler_probs, match.skill or {})
+        self.win_table = (target, table)
+
+    def current_win_table(self):
+        """WinTable for the current target, None until it is solved"""
+        if self.win_table is None or self.win_table[0] != self.target():
+            return None
+        return self.win_table[1]
+
+    def request_win_table(self):
+        """Solve the current target's table on a worker thread, then publish the win probability"""
+        if self.win_table_task is not None and not self.win_table_task.done():
+            return
+        self.win_table_task = asyncio.get_running_loop().create_task(self._publish_win_probability(self.target()))
+
+    async def _publish_win_probability(self, target):
+        await asyncio.to_thread(self.solve_win_table, target)
+        prob = self.win_probability()
+        if prob is not None:
+            self.publish([{"event": "win_probability", "innings": "a", "version": self.version, "data": prob}])
+        elif self.target() != target:
+            # the target moved on while solving
+            self.win_table_task = None
+            self.request_win_table()
+
+    def win_probability(self):
+        """
+        Chasing side's win probability right now; None without a matchup
+        model or while the table for the current target is not solved yet
+        """
+        match = self.match
+        table = self.current_win_table()
+        if table is None:
+            return None
+        state = self.states["a"]
+        runs_left = self.target() - state.score
+        balls_left = match.total_overs * 6 - state.legal_balls
+        prob = table_win_prob(table, runs_left, balls_left, state.wickets, state.junior_on_strike,
+                              min(state.striker_pos, state.non_striker_pos))
+        return {
+            "over": f"{state.legal_balls // 6}.{state.legal_balls % 6}",
+            "teamBScore": state.score,
+            "teamBWickets": state.wickets,
+            "teamBWinProb": prob * 100,
+            "teamAWinProb": 100 - prob * 100
+        }
+
+    def innings_snapshot(self, innings):
+        state = self.states[innings]
+        board = self.leaderboards[innings]
+        return {
+            "score": {"runs": state.score, "wickets": state.wickets, "balls": state.legal_balls},
+            "batters": [batter_row(name, stats) for name, stats in state.batter_info.items()],
+            "bowlers": [bowler_row(name, stats) for name, stats in state.bowler_info.items()],
+            "bowling_leaderboard": {metric: board.ranked_names(metric) for metric in board.entries},
+            "next_bowler": self.schedulers[innings].get_next_bowler(),
+            "overs": [over_row(row) for row in state.over_rows()],
+            "extras": dict(state.extras),
+            "partnerships": [partnership_row(p) for p in state.partnerships]
+        }
+
+    def snapshot(self):
+        """Everything a new subscriber needs before the incremental events"""
+        return {
+            "version": self.version,
+            "innings": {innings: self.innings_snapshot(innings) for innings in self.states},
+            "win_probability": self.win_probability()
+        }
+
+    def snapshot_event(self):
+        """snapshot() in the envelope of the incremental events"""
+        return {"event": "snapshot", "innings": None, "version": self.version, "data": self.snapshot()}
+
+    def apply(self, innings, ball):
+        """
+        Add one delivery to innings "a" or "b"; returns the list of
+        {"event", "innings", "version", "data"} changes it caused, or None
+        when that innings is already over
+        """
+        if self.innings_over(innings):
+            return None
+        state = self.states[innings]
+        d = state.apply(ball)
+        self.version += 1
+
+        changes = [("ball", {
+            "over": d.over, "ball": d.ball, "kind": d.kind, "bat_runs": d.bat_runs, "extra_runs": d.extra_runs,
+            "wicket": d.wicket, "score": d.score, "wickets": d.wickets, "batter": d.batter, "bowler": d.bowler
+        })]
+        if d.batter in state.batter_info:
+            changes.append(("batter", batter_row(d.batter, state.batter_info[d.batter])))
+        row = bowler_row(d.bowler, state.bowler_info[d.bowler])
+        changes.append(("bowler", row))
+        # the bowler of the over in progress cannot bowl the next one
+        self.schedulers[innings].rest(d.bowler)
+        # one bowler moved: only the metrics where its rank changed are resent
+        board = self.leaderboards[innings]
+        before = {metric: board.rank(metric, d.bowler) for metric in board.entries} if d.bowler in board.rows else {}
+        board.update(d.bowler, row["runs"], row["wickets"], row["overs"])
+        moved = {metric: board.ranked_names(metric) for metric in board.entries
+                 if before.get(metric) != board.rank(metric, d.bowler)}
+        if moved:
+            changes.append(("bowling_leaderboard", moved))
+        if d.kind:
+            changes.append(("extras", dict(state.extras)))
+        if d.legal and d.ball == 6 and not state.all_out:
+            over = state.overs[-1]
+            changes.append(("over", over_row(over)))
+            scheduler = self.schedulers[innings]
+            scheduler.record_over(d.bowler, over[1], over[2])
+            changes.append(("next_bowler", scheduler.get_next_bowler()))
+        elif state.all_out:
+            changes.append(("over", over_row(state.current_over())))
+        if d.wicket and not state.all_out:
+            changes.append(("partnership", partnership_row(state.partnerships[-2])))
+        changes.append(("partnership", partnership_row(state.partnerships[-1])))
+        if self.match.batter_bowler_probs:
+            if innings == "a":
+                prob = self.win_probability()
+                if prob is not None:
+                    changes.append(("win_probability", prob))
+                else:
+                    self.request_win_table()
+            elif self.innings_over("b") and self.current_win_table() is None:
+                # the target is settled now, have the chase table ready
+                self.request_win_table()
+
+        events = [{"event": name, "innings": innings, "version": self.version, "data": data}
+                  for name, data in changes]
+        self.publish(events)
+        return events
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+    def publish(self, events):
+        """
+        Queue events for every subscriber. One too far behind to take them
+        all gets its backlog swapped for a snapshot event instead, so it
+        resyncs rather than silently missing changes.
+        """
+        resync = None
+        for queue in self.subscribers:
+            if queue.qsize() + len(events) <= queue.maxsize:
+                for event in events:
+                    queue.put_nowait(event)
+                continue
+            if resync is None:
+                resync = self.snapshot_event()
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(resync)
@@ -0,0 +1,118 @@
+"""
+Bounded LRU map with hit/miss/eviction counters
+Used for memo tables and result caches that outlive a single request
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    OrderedDict based LRU cache, evicts the least recently used entry
+    - max_entries caps the number of entries
+    - max_bytes (optional) caps the summed sizeof(value) of all entries,
+      sizeof defaults to sys.getsizeof
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None, sizeof=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or sys.getsizeof
+        self.data = OrderedDict()
+        self.sizes = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Return cached value (marking it recently used) or default"""
+        try:
+            value = self.data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Insert or refresh an entry, evicting the oldest ones past the caps"""
+        self._insert(key, value, self.sizeof(value) if self.max_bytes is not None else None)
+
+    __setitem__ = put
+
+    def _insert(self, key, value, size):
+        if size is not None:
+            if size > self.max_bytes:
+                return
+            self.bytes += size - self.sizes.get(key, 0)
+            self.sizes[key] = size
+        self.data[key] = value
+        self.data.move_to_end(key)
+        while len(self.data) > self.max_entries or (self.max_bytes is not None and self.bytes > self.max_bytes):
+            old_key, _ = self.data.popitem(last=False)
+            self.bytes -= self.sizes.pop(old_key, 0)
+            self.evictions += 1
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __len__(self):
+        return len(self.data)
+
+    def clear(self):
+        self.data.clear()
+        self.sizes.clear()
+        self.bytes = 0
+
+    def stats(self):
+        """Counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.data),
+            "max_entries": self.max_entries,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+class LockedLRUCache(LRUCache):
+    """
+    LRUCache safe to share between threads (one lock around every operation)
+    - sizeof runs before the lock is taken, so a slow sizer (e.g. JSON
+      encoding a large result) does not block other readers
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None, sizeof=None):
+        super().__init__(max_entries, max_bytes, sizeof)
+        self.lock = threading.RLock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            return super().get(key, default)
+
+    def put(self, key, value):
+        size = self.sizeof(value) if self.max_bytes is not None else None
+        with self.lock:
+            self._insert(key, value, size)
+
+    __setitem__ = put
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.data
+
+    def clear(self):
+        with self.lock:
+            super().clear()
+
+    def stats(self):
+        with self.lock:
+            return super().stats()
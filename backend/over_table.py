@@ -0,0 +1,96 @@
+"""
+Array-backed over-wise scores
+OverTable keeps over number, runs and wickets in NumPy columns with prefix
+sums, so indexing and range queries are O(1), and still offers a
+linked-list style .head cursor for code written against OverNode
+"""
+
+import numpy as np
+
+
+class OverCursor:
+    """Read-only OverNode look-alike pointing at one row of an OverTable"""
+
+    __slots__ = ("table", "index")
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    @property
+    def over_num(self):
+        return int(self.table.over_num[self.index])
+
+    @property
+    def runs(self):
+        return int(self.table.runs[self.index])
+
+    @property
+    def wickets(self):
+        return int(self.table.wickets[self.index])
+
+    @property
+    def next(self):
+        nxt = self.index + 1
+        return OverCursor(self.table, nxt) if nxt < len(self.table) else None
+
+
+class OverTable:
+    """
+    Columns (one row per over, in order):
+    - over_num, runs, wickets: int32
+    - prefix_runs, prefix_wickets: running totals with a leading 0, so the
+      first i overs hold prefix_runs[i] runs
+    """
+
+    def __init__(self, rows=()):
+        data = np.array(list(rows), dtype=np.int32).reshape(-1, 3)
+        self.over_num = data[:, 0].copy()
+        self.runs = data[:, 1].copy()
+        self.wickets = data[:, 2].copy()
+        self.prefix_runs = np.concatenate(([0], np.cumsum(self.runs, dtype=np.int64)))
+        self.prefix_wickets = np.concatenate(([0], np.cumsum(self.wickets, dtype=np.int64)))
+
+    @classmethod
+    def coerce(cls, overs):
+        """Return overs as an OverTable, walking it first if it is an OverNode list"""
+        if isinstance(overs, cls):
+            return overs
+        rows = []
+        curr = overs
+        while curr:
+            rows.append((curr.over_num, curr.runs, curr.wickets))
+            curr = curr.next
+        return cls(rows)
+
+    def __len__(self):
+        return len(self.runs)
+
+    def __getitem__(self, i):
+        """(over_num, runs, wickets) of the i-th over (0-based)"""
+        return int(self.over_num[i]), int(self.runs[i]), int(self.wickets[i])
+
+    @property
+    def head(self):
+        """Cursor on the first over (None when empty), walk it with .next"""
+        return OverCursor(self, 0) if len(self) else None
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield OverCursor(self, i)
+
+    def runs_between(self, start, end):
+        """Runs in overs start..end (1-based positions, inclusive)"""
+        return int(self.prefix_runs[end] - self.prefix_runs[start - 1])
+
+    def wickets_between(self, start, end):
+        """Wickets in overs start..end (1-based positions, inclusive)"""
+        return int(self.prefix_wickets[end] - self.prefix_wickets[start - 1])
+
+    def records(self, start=0, end=None):
+        """Rows as [{"over", "runs", "wickets"}] dicts"""
+        return [
+            {"over": o, "runs": r, "wickets": w}
+            for o, r, w in zip(self.over_num[start:end].tolist(), self.runs[start:end].tolist(),
+                               self.wickets[start:end].tolist())
+        ]
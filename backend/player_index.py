@@ -0,0 +1,73 @@
+"""
+Process-wide player search index
+One PlayerTrie shared by every request, seeded once at startup and grown as
+matches bring in players it has not seen; a player's score is the number of
+posted matches they appeared in, so regulars rank first in autocomplete
+"""
+
+import threading
+
+from dsa2 import PlayerTrie, name_keys
+
+# Shorter queries only get exact prefix matches (one edit away from "s"
+# is every name)
+FUZZY_MIN_CHARS = 3
+FUZZY_MAX_EDITS = 1
+
+
+class PlayerIndex:
+    """
+    PlayerTrie behind a lock (inserts rewrite node caches, searches read them)
+    - record(players): one more appearance for each player, adding new ones
+    - add(players): adds unknown players without touching known scores
+    - search(query, k): exact token-prefix matches, then (for queries of
+      FUZZY_MIN_CHARS or more) matches within FUZZY_MAX_EDITS edits
+    - search_among(query, players): exact matches among a short list
+    """
+
+    def __init__(self):
+        self.trie = PlayerTrie()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.trie)
+
+    def record(self, players):
+        with self.lock:
+            scores = self.trie.scores
+            for player in set(players):
+                self.trie.insert(player, scores.get(player, 0) + 1)
+
+    def add(self, players):
+        with self.lock:
+            for player in set(players):
+                if player not in self.trie:
+                    self.trie.insert(player)
+
+    def search(self, query, k=None, fuzzy=True):
+        """[{"name", "appearances", "edits"}] best first, k at most when given"""
+        query = " ".join(query.lower().split())
+        if not query:
+            return []
+        with self.lock:
+            if fuzzy and len(query) >= FUZZY_MIN_CHARS:
+                matches = self.trie.fuzzy_search(query, k, FUZZY_MAX_EDITS)
+            else:
+                matches = [(name, 0) for name in self.trie.search(query, k)]
+            scores = self.trie.scores
+            return [{"name": name, "appearances": scores[name], "edits": edits} for name, edits in matches]
+
+    def search_among(self, query, players):
+        """
+        Names of the given players with a name token starting with query,
+        most appearances first. Checks the (few) names directly rather than
+        walking the whole index; only the scores are read under the lock.
+        """
+        query = " ".join(query.lower().split())
+        matches = {name for name in players if any(key.startswith(query) for key in name_keys(name))}
+        with self.lock:
+            scores = self.trie.scores
+            return sorted(matches, key=lambda name: (-scores.get(name, 0), name))
+
+
+player_index = PlayerIndex()
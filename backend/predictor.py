@@ -1,3 +1,33 @@
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from innings import InningsState, parse_delivery
+from lru import LockedLRUCache
+
+# Ball outcomes in the order used by the tabular engine
+OUTCOMES = (0, 1, 2, 3, 4, 6, 'W')
+RUN_OUTCOMES = (0, 1, 2, 3, 4, 6)
+MAX_WICKETS = 10
+RUN_PAD = max(RUN_OUTCOMES)
+# how far a supplied outcome distribution may be from summing to 1
+PROB_TOLERANCE = 0.05
+
+# Memo tables shared across overs and requests, keyed by model fingerprint.
+# A memo entry (5-int tuple key, float, OrderedDict link) measures about
+# MEMO_ENTRY_BYTES, so the state cap per model follows from a total byte
+# budget split across the models kept; a full 20-over chase from ball one
+# visits about 1.2M states.
+MEMO_MAX_BYTES = 640 * 1024 * 1024
+MEMO_MAX_MODELS = 2
+MEMO_ENTRY_BYTES = 240
+MEMO_MAX_STATES = MEMO_MAX_BYTES // MEMO_MAX_MODELS // MEMO_ENTRY_BYTES
+_memo_registry = LockedLRUCache(max_entries=MEMO_MAX_MODELS)
+_table_cache = LockedLRUCache(max_entries=16, max_bytes=256 * 1024 * 1024, sizeof=lambda table: table.nbytes)
+
+
 def adjusted_probs_for_batter(batter, bowler,skill,batter_bowler_probs):
     """
     Return a new probs dict shifted by batter skill:
@@ -21,23 +51,118 @@ def adjusted_probs_for_batter(batter, bowler,skill,batter_bowler_probs):
         newp[k] /= total
     return newp
 
+class MatchupTable:
+    """
+    Skill-adjusted outcome distributions compiled once into a dense array
+    probs[batter_idx, bowler_idx, outcome], outcomes ordered as OUTCOMES.
+    - Every supplied row must sum to 1 within tol (hand-entered rows are
+      often off by a rounding step), else ValueError; rows are renormalized.
+    - Missing batter/bowler pairs get a fallback row: the given fallback
+      distribution, else the batter's average row, else the bowler's
+      average row, else the average of all rows.
+    """
+
+    def __init__(self, batters, bowlers, batter_bowler_probs, skill, fallback=None, tol=PROB_TOLERANCE):
+        self.batters = list(batters)
+        self.bowler_names = list(dict.fromkeys(bowlers))
+        self.batter_index = {b: i for i, b in enumerate(self.batters)}
+        self.bowler_index = {b: j for j, b in enumerate(self.bowler_names)}
+
+        n_bat, n_bowl = len(self.batters), len(self.bowler_names)
+        base = np.zeros((n_bat, n_bowl, len(OUTCOMES)))
+        known = np.zeros((n_bat, n_bowl), dtype=bool)
+        for i, batter in enumerate(self.batters):
+            rows = batter_bowler_probs.get(batter, {})
+            for j, bowler in enumerate(self.bowler_names):
+                if bowler in rows:
+                    base[i, j] = self._validated_row(rows[bowler], tol, f"{batter} vs {bowler}")
+                    known[i, j] = True
+
+        if not known.all():
+            base[~known] = self._fallback_rows(base, known, fallback, tol)[~known]
+        self.missing_pairs = [(self.batters[i], self.bowler_names[j]) for i, j in zip(*np.nonzero(~known))]
+
+        # skill < 1 moves mass from scoring outcomes into 'W', as in
+        # adjusted_probs_for_batter
+        s = np.array([skill.get(b, 1.0) for b in self.batters])[:, None]
+        adjusted = np.empty_like(base)
+        adjusted[..., :6] = base[..., :6] * s[..., None]
+        adjusted[..., 6] = base[..., 6] + base[..., :6].sum(axis=2) * (1.0 - s)
+        self.probs = adjusted / adjusted.sum(axis=2, keepdims=True)
+        # plain nested lists for the pure-Python DFS
+        self.rows = self.probs.tolist()
+
+    @staticmethod
+    def _validated_row(row, tol, label):
+        values = [row.get(o, 0.0) for o in OUTCOMES]
+        total = sum(values)
+        if abs(total - 1.0) > tol:
+            raise ValueError(f"Outcome probabilities for {label} sum to {total}, expected 1")
+        return [v / total for v in values]
+
+    def _fallback_rows(self, base, known, fallback, tol):
+        """Fallback distribution for every (batter, bowler) cell"""
+        if fallback is not None:
+            row = self._validated_row(fallback, tol, "fallback")
+            return np.broadcast_to(np.array(row), base.shape)
+        if not known.any():
+            raise ValueError("batter_bowler_probs has no rows for these batters and bowlers")
+
+        weights = known[..., None]
+        overall = (base * weights).sum(axis=(0, 1)) / known.sum()
+        per_batter = (base * weights).sum(axis=1)
+        per_bowler = (base * weights).sum(axis=0)
+        n_batter = known.sum(axis=1)[:, None]
+        n_bowler = known.sum(axis=0)[:, None]
+
+        rows = np.empty_like(base)
+        rows[:] = overall
+        has_bowler = n_bowler[:, 0] > 0
+        rows[:, has_bowler] = per_bowler[has_bowler] / n_bowler[has_bowler]
+        has_batter = n_batter[:, 0] > 0
+        rows[has_batter] = (per_batter[has_batter] / n_batter[has_batter])[:, None, :]
+        return rows
+
+    def row(self, batter_idx, bowler):
+        """Outcome probabilities (ordered as OUTCOMES) for a batter vs a named bowler"""
+        return self.rows[batter_idx][self.bowler_index[bowler]]
+
+
 # DFS using adjusted probs (no final multiplicative wicket factor)
-def dfs_win_prob(runs_left, balls_left, wickets_left, striker_idx, non_striker_idx, bowler_idx,bowlers,batters,batter_bowler_probs,skill,memo):
+def dfs_win_prob(runs_left, balls_left, wickets_left, striker_idx, non_striker_idx,bowlers,batters,batter_bowler_probs,skill,memo,table=None,total_balls=None):
+    """
+    Exact chase probability by depth-first search over the planned bowling
+    order: over k of the innings is bowled by bowlers[k % len(bowlers)].
+    - total_balls is the innings length (default: one over per entry of
+      bowlers). The over index and ball-in-over follow from balls_left, so
+      the bowler is never part of the state and the memo key stays
+      (runs_left, balls_left, wickets_left, striker_idx, non_striker_idx).
+    - Strike changes on odd runs and at the end of every over; after a
+      wicket the next batter in the order comes in on strike.
+    """
     if runs_left <= 0:
         return 1.0
     if balls_left == 0 or wickets_left == 0:
         return 0.0
 
-    key = (runs_left, balls_left, wickets_left, striker_idx, non_striker_idx, bowler_idx)
-    if key in memo:
-        return memo[key]
+    key = (runs_left, balls_left, wickets_left, striker_idx, non_striker_idx)
+    cached = memo.get(key)
+    if cached is not None:
+        return cached
+
+    if table is None:
+        table = MatchupTable(batters, bowlers, batter_bowler_probs, skill)
+    if total_balls is None:
+        total_balls = len(bowlers) * 6
+
+    over_idx, ball_in_over = divmod(total_balls - balls_left, 6)
+    over_ends = ball_in_over == 5
+    bowler = bowlers[over_idx % len(bowlers)]
 
     prob = 0.0
-    striker = batters[striker_idx]
-    bowler = bowlers[bowler_idx % len(bowlers)]
-    probs = adjusted_probs_for_batter(striker, bowler,skill,batter_bowler_probs)
+    probs = table.row(striker_idx, bowler)
 
-    for outcome, p in probs.items():
+    for outcome, p in zip(OUTCOMES, probs):
         next_runs_left = runs_left
         next_wickets_left = wickets_left
         next_striker = striker_idx
@@ -46,42 +171,359 @@ def dfs_win_prob(runs_left, balls_left, wickets_left, striker_idx, non_striker_i
 
         if outcome == 'W':
             next_wickets_left -= 1
-            if next_wickets_left > 0 and striker_idx + 1 < len(batters):
-                next_striker = striker_idx + 1
+            incoming = max(striker_idx, non_striker_idx) + 1
+            if next_wickets_left > 0 and incoming < len(batters):
+                next_striker = incoming
         else:
             next_runs_left = max(0, runs_left - outcome)
             if outcome % 2 == 1:
                 next_striker, next_non_striker = next_non_striker, next_striker
 
-        next_bowler_idx = bowler_idx  # keep same in-DFS; rotation handled outside
+        if over_ends:
+            next_striker, next_non_striker = next_non_striker, next_striker
 
         prob += p * dfs_win_prob(next_runs_left, next_balls_left, next_wickets_left,
-                                 next_striker, next_non_striker, next_bowler_idx,bowlers,batters,batter_bowler_probs,skill,memo)
+                                 next_striker, next_non_striker,bowlers,batters,batter_bowler_probs,skill,memo,table,total_balls)
 
     memo[key] = prob
     return prob
 
 
+def _canonical(obj):
+    """Order-independent, hashable view of nested dicts/lists"""
+    if isinstance(obj, dict):
+        return tuple(sorted((str(k), _canonical(v)) for k, v in obj.items()))
+    if isinstance(obj, (list, tuple)):
+        return tuple(_canonical(v) for v in obj)
+    return obj
+
+
+def model_fingerprint(batter_bowler_probs, skill, batters, bowlers, total_overs=None):
+    """
+    Stable hash of everything a memoized state depends on.
+    The batting and bowling orders and the innings length are included
+    because the memo keys index into them.
+    """
+    canon = _canonical((batter_bowler_probs, skill, list(batters), list(bowlers), total_overs))
+    return hashlib.sha1(repr(canon).encode()).hexdigest()
+
+
+def shared_memo(batter_bowler_probs, skill, batters, bowlers, total_overs=None, max_states=MEMO_MAX_STATES):
+    """
+    Return the DFS memo for this matchup table, skill map and bowling plan,
+    creating it on first use. The memo lives across overs and requests with
+    an LRU bound; it is a LockedLRUCache because innings pipelines run on a
+    thread pool and may walk the same model at once.
+    """
+    fp = model_fingerprint(batter_bowler_probs, skill, batters, bowlers, total_overs)
+    memo = _memo_registry.get(fp)
+    if memo is None:
+        memo = LockedLRUCache(max_entries=max_states)
+        _memo_registry.put(fp, memo)
+    return memo
+
+
+def memo_stats():
+    """Hit/miss counters of the shared memo tables"""
+    with _memo_registry.lock:
+        memos = list(_memo_registry.data.items())
+    return {
+        "models": _memo_registry.stats(),
+        "states": {fp: memo.stats() for fp, memo in memos},
+        "tables": _table_cache.stats()
+    }
+
+
+# ------------------------------
+# Tabular (bottom-up) win probability engine
+# ------------------------------
+
+def _over_bowlers(matchups, bowlers, total_overs):
+    """MatchupTable bowler index for every over of the planned bowling order"""
+    return [matchups.bowler_index[bowlers[k % len(bowlers)]] for k in range(total_overs)]
+
+
+def all_out_wickets(n_bat):
+    """Wickets that end the innings: MAX_WICKETS, or fewer with a short batting list"""
+    return min(MAX_WICKETS, n_bat - 1)
+
+
+def crease_states(n_bat):
+    """
+    Every pair the chase can have at the crease, in table order.
+    After w wickets the pair is the survivor s (the earlier batter, any of
+    0..w) and the junior w + 1, the latest arrival. Returns
+    - states: [(w, s)], the all-out state (all_out_wickets(n_bat), 0) last
+    - index: {(w, s): position in states}
+    - wicket_next[i, strike], wicket_strike[i, strike]: state and strike after
+      the striker is out, before any end-of-over change. The incoming batter
+      takes strike; once nobody is left to come in the innings is over.
+    """
+    all_out = all_out_wickets(n_bat)
+    states = [(w, s) for w in range(all_out) for s in range(w + 1)]
+    states.append((all_out, 0))
+    index = {state: i for i, state in enumerate(states)}
+    wicket_next = np.full((len(states), 2), len(states) - 1)
+    wicket_strike = np.zeros((len(states), 2), dtype=int)
+    for i, (w, s) in enumerate(states[:-1]):
+        if w + 1 == all_out:
+            continue
+        for strike in (0, 1):
+            wicket_next[i, strike] = index[(w + 1, s if strike else w + 1)]
+            wicket_strike[i, strike] = 1
+    return states, index, wicket_next, wicket_strike
+
+
+def _crease_probs(matchups, states):
+    """
+    probs[bowler, state, strike, outcome] for the pair of every crease state
+    (strike 1 = junior on strike). The all-out state is a zero row.
+    """
+    crease = np.array([[s, w + 1] for w, s in states[:-1]])
+    probs = matchups.probs.transpose(1, 0, 2)[:, crease]
+    return np.concatenate([probs, np.zeros_like(probs[:, :1])], axis=1)
+
+
+class WinTable:
+    """
+    Win probabilities of every chase state, built by solve_win_table
+    - probs[balls_left, runs_left + RUN_PAD, crease, strike] (float32)
+    - crease indexes (wickets_fallen, survivor) through index
+    - all_out: wickets that end the chase
+    """
+
+    def __init__(self, probs, index, all_out):
+        self.probs = probs
+        self.index = index
+        self.all_out = all_out
+
+    @property
+    def nbytes(self):
+        return self.probs.nbytes
+
+
+def solve_win_table(target_runs, total_overs, batters, bowlers, batter_bowler_probs, skill, matchups=None):
+    """
+    Fill the whole chase state space bottom-up, one ball at a time, and
+    return a WinTable; read it through table_win_prob.
+    - The state is (balls_left, runs_left, crease, strike) where crease is
+      the wickets fallen plus the batting position of the survivor at the
+      other end (see crease_states), so the model matches dfs_win_prob.
+    - The bowler of each ball follows the planned order: over k is bowled by
+      bowlers[k % len(bowlers)].
+    - Strike changes on odd runs and at the end of every over; a new batter
+      takes strike after a wicket.
+    - Each ball is seven contiguous multiply-adds over a (runs, crease *
+      strike) layer: the strike-swapped layer and the after-a-wicket layer
+      are gathered once per ball, and only runs_left up to 6 * balls_left is
+      filled (the rest cannot be scored and stays 0).
+    - Cost is O(balls * runs * crease states), about 55 crease states for a
+      full batting order. On one core a 20-over chase solves in about 20 ms
+      (7 MB); a 50-over chase of 300 takes about 100 ms (39 MB), so 50-over
+      tables are worth solving once and caching (cached_win_table).
+    """
+    if matchups is None:
+        matchups = MatchupTable(batters, bowlers, batter_bowler_probs, skill)
+    total_balls = total_overs * 6
+    over_bowler = _over_bowlers(matchups, bowlers, total_overs)
+    states, index, wicket_next, wicket_strike = crease_states(len(matchups.batters))
+    n_cols = len(states) * 2
+    # coef[bowler, outcome, column] with column = crease * 2 + strike
+    coef = np.ascontiguousarray(_crease_probs(matchups, states).astype(np.float32)
+                                .reshape(-1, n_cols, len(OUTCOMES)).transpose(0, 2, 1))
+    swap_cols = np.arange(n_cols) ^ 1
+    wicket_cols = [(wicket_next * 2 + (wicket_strike ^ ends)).ravel() for ends in (0, 1)]
+
+    # rows 0..RUN_PAD stand for runs_left <= 0, so a scoring shot never
+    # indexes below the table; runs_left r lives at row r + RUN_PAD
+    n_rows = target_runs + 1 + RUN_PAD
+    table = np.zeros((total_balls + 1, n_rows, len(states), 2), dtype=np.float32)
+    table[:, :RUN_PAD + 1] = 1.0
+    layers = table.reshape(total_balls + 1, n_rows, n_cols)
+    scratch = np.empty((n_rows, n_cols), dtype=np.float32)
+
+    for balls_left in range(1, total_balls + 1):
+        ball_no = total_balls - balls_left
+        over_ends = ball_no % 6 == 5
+        if over_ends:
+            # spread this over's coefficients down every row once, so the
+            # multiply-adds below run on same-shape contiguous arrays
+            c = np.repeat(coef[over_bowler[ball_no // 6]][:, None], n_rows, axis=1)
+        end = min(n_rows, RUN_PAD + 1 + 6 * balls_left)
+        rows = end - RUN_PAD - 1
+        prev = layers[balls_left - 1, :end]
+        swapped = prev[:, swap_cols]
+        cur = layers[balls_left, RUN_PAD + 1:end]
+        tmp = scratch[:rows]
+
+        for k, r in enumerate(RUN_OUTCOMES):
+            nxt = swapped if (r % 2 == 1) != over_ends else prev
+            np.multiply(c[k, :rows], nxt[RUN_PAD + 1 - r:end - r], out=tmp)
+            cur += tmp
+
+        # wicket: move to the next crease state, end of over still swaps
+        np.multiply(c[-1, :rows], prev[RUN_PAD + 1:, wicket_cols[over_ends]], out=tmp)
+        cur += tmp
+
+    return WinTable(table, index, states[-1][0])
+
+
+def table_win_prob(table, runs_left, balls_left, wickets_fallen, strike, survivor):
+    """
+    O(1) lookup into a WinTable; survivor is the batting position of the
+    earlier of the two batters at the crease
+    """
+    if runs_left <= 0:
+        return 1.0
+    if balls_left <= 0 or wickets_fallen >= table.all_out:
+        return 0.0
+    probs = table.probs
+    crease = table.index[(wickets_fallen, survivor)]
+    return float(probs[balls_left, min(runs_left + RUN_PAD, probs.shape[1] - 1), crease, strike])
+
+
+def cached_win_table(target_runs, total_overs, batters, bowlers, batter_bowler_probs, skill, matchups=None):
+    """solve_win_table through the shared table cache, keyed by model and chase"""
+    fp = model_fingerprint(batter_bowler_probs, skill, batters, bowlers)
+    table = _table_cache.get((fp, target_runs, total_overs))
+    if table is None:
+        table = solve_win_table(target_runs, total_overs, batters, bowlers, batter_bowler_probs, skill, matchups)
+        _table_cache.put((fp, target_runs, total_overs), table)
+    return table
+
+
+# ------------------------------
+# Monte Carlo chase simulator
+# ------------------------------
+
+OUTCOME_RUNS = np.array([0, 1, 2, 3, 4, 6, 0], dtype=np.int32)
+WICKET = len(OUTCOMES) - 1
+
+
+def _simulate_batch(rng, n, cum, over_bowler, runs_left, balls_left, crease, strike, wicket_next, wicket_strike,
+                    crease_wickets, all_out):
+    """
+    Play n chases from the same state, one ball at a time across all of
+    them at once. Returns (runs scored, wickets fallen) per simulation.
+    """
+    total_balls = len(over_bowler) * 6
+    final_runs = np.zeros(n, dtype=np.int32)
+    final_wkts = np.zeros(n, dtype=np.int32)
+
+    ids = np.arange(n)
+    scored = np.zeros(n, dtype=np.int32)
+    cst = np.full(n, crease, dtype=np.int32)
+    strk = np.full(n, strike, dtype=np.int32)
+
+    for ball_no in range(total_balls - balls_left, total_balls):
+        if ids.size == 0:
+            break
+        c = cum[over_bowler[ball_no // 6], cst, strk]
+        outcome = (rng.random(ids.size)[:, None] >= c).sum(axis=1)
+        out = outcome == WICKET
+        runs = OUTCOME_RUNS[outcome]
+        scored += runs
+        cst, strk = (np.where(out, wicket_next[cst, strk], cst),
+                     np.where(out, wicket_strike[cst, strk], strk ^ (runs & 1)))
+        if ball_no % 6 == 5:
+            strk ^= 1
+
+        # finished chases leave the working arrays
+        wkts = crease_wickets[cst]
+        done = (scored >= runs_left) | (wkts >= all_out)
+        if done.any():
+            final_runs[ids[done]] = scored[done]
+            final_wkts[ids[done]] = wkts[done]
+            keep = ~done
+            ids, scored, cst, strk = ids[keep], scored[keep], cst[keep], strk[keep]
+
+    final_runs[ids] = scored
+    final_wkts[ids] = crease_wickets[cst]
+    return final_runs, final_wkts
+
+
+def _distribution(values, offset=0):
+    """Mean, central 95% interval and {value: share} of integer samples"""
+    counts = np.bincount(values)
+    lo, hi = np.percentile(values, [2.5, 97.5])
+    return {
+        "mean": float(values.mean()) + offset,
+        "ci": [float(lo) + offset, float(hi) + offset],
+        "distribution": {int(v) + offset: float(counts[v] / values.size) for v in np.flatnonzero(counts)}
+    }
+
+
+def simulate_chase(target_runs, current_score, balls_left, wickets_fallen, strike, total_overs,
+                   batters, bowlers, batter_bowler_probs, skill, matchups=None,
+                   max_sims=100_000, tolerance=None, batch_size=10_000, seed=None, survivor=None):
+    """
+    Monte Carlo estimate of a chase from the given state, using the same
+    outcome model and crease/strike conventions as solve_win_table.
+    - survivor is the batting position of the earlier batter at the crease
+      (defaults to the senior-most one possible, wickets_fallen).
+    - Simulations run vectorized in batches of batch_size, drawn from a
+      numpy.random.Generator seeded with seed.
+    - With tolerance set, sampling stops as soon as the 95% confidence
+      half-width of the win probability is within tolerance; max_sims caps
+      the total either way.
+    Returns the win probability with its confidence interval plus final
+    score and wickets distributions.
+    """
+    if max_sims < 1:
+        raise ValueError(f"max_sims must be at least 1, got {max_sims}")
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+    if matchups is None:
+        matchups = MatchupTable(batters, bowlers, batter_bowler_probs, skill)
+    rng = np.random.default_rng(seed)
+    runs_left = target_runs - current_score
+    states, index, wicket_next, wicket_strike = crease_states(len(matchups.batters))
+    crease_wickets = np.array([w for w, _ in states], dtype=np.int32)
+    cum = np.cumsum(_crease_probs(matchups, states), axis=3)
+    cum[..., -1] = 1.0
+    over_bowler = _over_bowlers(matchups, bowlers, total_overs)
+    all_out = states[-1][0]
+    decided = runs_left <= 0 or balls_left <= 0 or wickets_fallen >= all_out
+    if not decided:
+        if survivor is None:
+            survivor = wickets_fallen
+        crease = index[(wickets_fallen, survivor)]
+
+    runs_parts, wkts_parts = [], []
+    sims = wins = 0
+    while sims < max_sims:
+        n = min(batch_size, max_sims - sims)
+        if decided:
+            runs, wkts = np.zeros(n, dtype=np.int32), np.full(n, wickets_fallen, dtype=np.int32)
+        else:
+            runs, wkts = _simulate_batch(rng, n, cum, over_bowler, runs_left, balls_left, crease, strike,
+                                         wicket_next, wicket_strike, crease_wickets, all_out)
+        runs_parts.append(runs)
+        wkts_parts.append(wkts)
+        sims += n
+        wins += int((runs >= runs_left).sum())
+
+        p = wins / sims
+        half_width = 1.96 * (p * (1 - p) / sims) ** 0.5
+        if tolerance is not None and half_width <= tolerance:
+            break
+
+    return {
+        "sims": sims,
+        "win_prob": p,
+        "win_prob_ci": [max(0.0, p - half_width), min(1.0, p + half_width)],
+        "final_score": _distribution(np.concatenate(runs_parts), current_score),
+        "wickets": _distribution(np.concatenate(wkts_parts))
+    }
+
+
 # Function to get run value and balls consumed
 def parse_ball(run):
     """
     Returns (runs_scored, balls_consumed)
     """
-    if isinstance(run,int):
-        return run,1
-    run = str(run)
-    if run.startswith("LB"):
-        # Leg bye or bye, counts as runs but ball is counted
-        return int(run[2:]),1
-    if run.startswith("B"):
-        return int(run[1:]),1
-    if run == "WD":
-        return 1,0  # wide: +1 run, ball not counted
-    if run == "NB":
-        return 1,0  # no ball: +1 run, ball not counted
-    if run == "W":
-        return 0,1  # wicket, ball counted
-    return int(run),1  # fallback for numeric string
+    kind, bat_runs, extra_runs, _ = parse_delivery(run)
+    return bat_runs + extra_runs, 0 if kind in ("WD", "NB") else 1
 
 
 # ------------------------------
@@ -90,49 +532,120 @@ def parse_ball(run):
 
 
 
-def predict(runs, batters, bowlers, target_runs, total_overs,batter_bowler_probs,skill,memo):
-    balls_bowled = 0
-    current_score = 0
-    wickets_fallen = 0
-    striker_idx = 0
-    non_striker_idx = 1
-    bowler_idx = 0
+# Monte Carlo settings used by predict(engine="mc") unless overridden
+MC_DEFAULTS = {"max_sims": 20_000, "tolerance": 0.01, "batch_size": 5_000, "seed": None}
+
+# Process pools reused by every predict call with workers > 1, one per
+# worker count. A pool is never shut down while the process runs, so a call
+# can never submit to a pool another call just retired.
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _solve_over(ctx, state):
+    """Win probability (and MC confidence interval) for one over-end state"""
+    runs_left, balls_left, wickets_fallen, strike, striker_idx, non_striker_idx = state
+    survivor = min(striker_idx, non_striker_idx)
+    if ctx["engine"] == "table":
+        return table_win_prob(ctx["table"], runs_left, balls_left, wickets_fallen, strike, survivor), None
+    if ctx["engine"] == "mc":
+        sim = simulate_chase(ctx["target_runs"], ctx["target_runs"] - runs_left, balls_left, wickets_fallen, strike,
+                             ctx["total_overs"], ctx["batters"], ctx["bowlers"], None, None, ctx["matchups"],
+                             survivor=survivor, **ctx["mc_options"])
+        return sim["win_prob"], sim["win_prob_ci"]
+    wickets_left = all_out_wickets(len(ctx["batters"])) - wickets_fallen
+    prob = dfs_win_prob(runs_left, balls_left, wickets_left, striker_idx, non_striker_idx,
+                        ctx["bowlers"], ctx["batters"], None, None, ctx["memo"], ctx["matchups"],
+                        ctx["total_overs"] * 6)
+    return prob, None
+
+
+def _process_pool(workers):
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+
+def _solve_overs(ctx, states):
+    """Pool task: a contiguous run of over-end states sharing one ctx"""
+    return [_solve_over(ctx, state) for state in states]
+
+
+def predict(runs, batters, bowlers, target_runs, total_overs,batter_bowler_probs,skill,memo=None,engine="table",mc_options=None,workers=None,state=None):
+    """
+    Win probability of the chasing side after every over.
+    engine="table" solves the whole chase once with solve_win_table and reads
+    every over from it; engine="dfs" runs dfs_win_prob per over against the
+    shared memo for this model (or the memo passed in); engine="mc" runs
+    simulate_chase per over with MC_DEFAULTS updated by mc_options and also
+    reports the confidence interval.
+    workers > 1 fans the per-over mc solves out to a long-lived process
+    pool: the overs are cut into one contiguous chunk per worker, so each
+    call pickles its ctx (with the compiled MatchupTable) once per chunk
+    rather than once per over, and results keep over order. dfs stays serial, since later overs are sub-trees of earlier ones
+    and only a single shared memo turns that into reuse.
+    Score, wickets and strike come from the InningsState (replayed from runs
+    when no state is passed).
+    """
+    last_over_start = total_overs*6 - 6
     predictingData=[]
+    states=[]
+    if state is None:
+        state = InningsState.from_deliveries(runs, bowlers, batters)
 
-    print("Over\tScore\tWickets\tWinProb%")
-    for run in runs:
-        run_value, ball_count = parse_ball(run)
-        
-        if run=="W":
-            wickets_fallen +=1
-            if striker_idx+1 < len(batters):
-                striker_idx +=1
-        else:
-            current_score += run_value
-            if run_value %2 ==1:
-                striker_idx, non_striker_idx = non_striker_idx, striker_idx
-        
-        balls_bowled += ball_count
-        
-        # after each over
-        if balls_bowled %6 ==0 or balls_bowled>114:
+    matchups = MatchupTable(batters, bowlers, batter_bowler_probs, skill)
+    ctx = {
+        "engine": engine,
+        "target_runs": target_runs,
+        "total_overs": total_overs,
+        "batters": batters,
+        "bowlers": bowlers,
+        "matchups": matchups
+    }
+    if engine == "table":
+        ctx["table"] = cached_win_table(target_runs, total_overs, batters, bowlers, batter_bowler_probs, skill, matchups)
+    elif engine == "mc":
+        ctx["mc_options"] = {**MC_DEFAULTS, **(mc_options or {})}
+    else:
+        ctx["memo"] = memo if memo is not None else shared_memo(batter_bowler_probs, skill, batters, bowlers, total_overs)
+
+    all_out = all_out_wickets(len(batters))
+    for d in state.deliveries:
+        balls_bowled = d.legal_balls
+        over_complete = d.legal and d.ball == 6
+
+        # after each over, and on the ball that ends the innings
+        if over_complete or balls_bowled>last_over_start or (d.wicket and d.wickets == all_out):
             balls_left = total_overs*6 - balls_bowled
-            wickets_left = 10 - wickets_fallen
-            runs_left = target_runs - current_score
-            memo.clear()
-            prob = dfs_win_prob(runs_left, balls_left, wickets_left, striker_idx, non_striker_idx, bowler_idx,bowlers,batters,batter_bowler_probs,skill,memo)
+            runs_left = target_runs - d.score
+            strike = int(d.striker_pos > d.non_striker_pos)
+            states.append((runs_left, balls_left, d.wickets, strike, d.striker_pos, d.non_striker_pos))
             data={
             "over": balls_bowled//6,
-            "teamBScore": current_score,
-            "teamBWickets": wickets_fallen,
-            "teamBWinProb": prob*100,
-            "teamAWinProb": 100-prob*100
+            "teamBScore": d.score,
+            "teamBWickets": d.wickets
             }
-            if balls_bowled>114:
+            if balls_bowled>last_over_start or not over_complete:
                 data["over"] = float(str(balls_bowled//6)+"."+str(balls_bowled%6))
             predictingData.append(data)
-            print(f"{balls_bowled//6}\t{current_score}\t{wickets_fallen}\t{prob*100:.2f}%")
-            bowler_idx +=1  # rotate bowler each over
+
+    if workers and workers > 1 and engine == "mc" and len(states) > 1:
+        pool = _process_pool(workers)
+        step = -(-len(states) // workers)
+        chunks = [pool.submit(_solve_overs, ctx, states[i:i + step]) for i in range(0, len(states), step)]
+        results = [result for chunk in chunks for result in chunk.result()]
+    else:
+        results = [_solve_over(ctx, state) for state in states]
+
+    print("Over\tScore\tWickets\tWinProb%")
+    for data, (prob, ci) in zip(predictingData, results):
+        data["teamBWinProb"] = prob*100
+        data["teamAWinProb"] = 100-prob*100
+        if ci is not None:
+            data["teamBWinProbCI"] = [x*100 for x in ci]
+        print(f"{int(data['over'])}\t{data['teamBScore']}\t{data['teamBWickets']}\t{prob*100:.2f}%")
     return predictingData
     
 
@@ -0,0 +1,63 @@
+"""
+Leaderboards as index permutations
+A Ranking keeps one canonical list of row dicts and, per metric, the stable
+argsort of the rows (ties keep row order). Orders are computed on first use
+and rows are only materialized when a sorted list is asked for, so one row
+list serves every leaderboard of a season without copies.
+"""
+
+import numpy as np
+
+# metric name -> (row field, descending)
+BATTING_METRICS = {
+    "runs": ("runs", True),
+    "sr": ("sr", True),
+    "fours": ("fours", True),
+    "sixes": ("sixes", True)
+}
+BOWLING_METRICS = {
+    "economy": ("economy", False),
+    "runs": ("runs", False),
+    "wickets": ("wickets", True)
+}
+
+
+def stable_argsort(values, descending=False):
+    """Indices that sort values; equal values keep their order either way"""
+    values = np.asarray(values, dtype=float)
+    return np.argsort(-values if descending else values, kind="stable")
+
+
+class Ranking:
+    """
+    rows: list of dicts, metrics: {name: (row field, descending)}
+    - order(metric): NumPy index array, best first
+    - indices(metric) / orders(): the same as plain lists (JSON-ready)
+    - ranked(metric, k): the rows themselves (shared, not copied), top k
+      when k is given
+    """
+
+    def __init__(self, rows, metrics):
+        self.rows = rows
+        self.metrics = metrics
+        self._orders = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def order(self, metric):
+        if metric not in self._orders:
+            field, descending = self.metrics[metric]
+            self._orders[metric] = stable_argsort([row[field] for row in self.rows], descending)
+        return self._orders[metric]
+
+    def indices(self, metric, k=None):
+        return self.order(metric)[:k].tolist()
+
+    def orders(self):
+        """{metric: [row index, ...]} for every metric"""
+        return {metric: self.indices(metric) for metric in self.metrics}
+
+    def ranked(self, metric, k=None):
+        rows = self.rows
+        return [rows[i] for i in self.indices(metric, k)]
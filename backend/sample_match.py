@@ -0,0 +1,127 @@
+"""
+Sample match served by /cricket-analysis when the request has no body
+innings A is the chase (147 to win in 20 overs), innings B the first innings
+"""
+
+runs = [0,4,0,0,1,2,"W",0,1,0,0,2,0,0,"W",0,1,1,1,1,2,0,4,"W",0,0,1,0,0,4,0,0,4,6,0,1,0,4,0,0,1,1,1,1,4,1,0,0,1,1,1,1,1,0,1,1,1,0,1,0,1,1,6,1,1,1,1,0,0,0,6,0,1,"W",0,0,1,0,1,1,1,0,1,1,4,1,4,1,1,6,6,"WD",1,1,0,1,1,1,1,0,2,1,1,1,"WD",1,1,2,1,6,1,1,1,4,0,"W",2,6,1,4]
+bowlers = ["Shaheen Shah Afridi", "Faheem", "Shaheen Shah Afridi","Faheem","Shaheen Shah Afridi","Faheem","Nawaz","Haris Rauf","Abrar Ahmed","Saim Ayub","Abrar Ahmed","Saim Ayub","Abrar Ahmed","Saim Ayub","Haris Rauf","Abrar Ahmed","Shaheen Shah Afridi","Haris Rauf","Faheem","Haris Rauf"]
+batters = ["Abhishek Sharma","Shubman Gill","Suryakumar Yadav","Tilak Varma","Sanju Samson","Shivam Dube","Rinku Singh","Axar Patel","Kuldeep Yadav","Varun Chakaravarthy","Jasprit Bumrah"]
+
+runsB=[0,0,0,0,4,0,"LB1",0,0,2,4,0,1,1,1,1,0,4,4,0,6,1,"B1",1,0,1,0,2,1,1,0,0,1,2,1,4,1,1,1,0,2,6,1,2,0,4,1,0,"WD",1,6,"B1",2,1,1,0,1,6,"W",1,2,1,1,4,0,4,1,1,4,0,1,1,2,"WD",0,1,"WD",2,1,"W",0,0,1,"W",1,1,2,2,0,6,"W",1,1,2,1,"W",0,1,1,"W",0,"WD",0,"W",0,"W",1,4,0,2,"W",0,2,0,0,1,1,1,"W"]
+bowlersB=["Shivam Dube","Jasprit Bumrah","Shivam Dube","Jasprit Bumrah","Varun Chakaravarthy","Axar Patel","Kuldeep Yadav","Axar Patel","Kuldeep Yadav","Varun Chakaravarthy","Shivam Dube","Tilak Varma","Kuldeep Yadav","Axar Patel","Varun Chakaravarthy","Axar Patel","Kuldeep Yadav","Jasprit Bumrah","Varun Chakaravarthy","Jasprit Bumrah"]
+battersB=["Sahibzada Farhan","Fakhar Zaman","Saim Ayub","Mohammad Haris","Salman Ali Agha","Hussain Talt","Mohammad Nawaz","Shaheen Afridi","Faheem Ashraf","Haris Rauf","Abrar Ahmed"]
+
+batter_bowler_probs = {
+"Abhishek Sharma": {
+    "Shaheen Shah Afridi": {0:0.30,1:0.25,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Faheem": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Haris Rauf": {0:0.28,1:0.27,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Nawaz": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
+    "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
+},
+"Shubman Gill": {
+    "Shaheen Shah Afridi": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Faheem": {0:0.20,1:0.35,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Haris Rauf": {0:0.22,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Nawaz": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
+    "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
+    "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
+},
+"Suryakumar Yadav": {
+    "Shaheen Shah Afridi": {0:0.20,1:0.25,2:0.05,3:0.05,4:0.25,6:0.10,'W':0.10},
+    "Faheem": {0:0.22,1:0.25,2:0.05,3:0.05,4:0.25,6:0.08,'W':0.10},
+    "Haris Rauf": {0:0.20,1:0.25,2:0.05,3:0.05,4:0.25,6:0.10,'W':0.10},
+    "Nawaz": {0:0.20,1:0.25,2:0.05,3:0.05,4:0.25,6:0.10,'W':0.10},
+    "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
+    "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
+},
+"Tilak Varma": {
+    "Shaheen Shah Afridi": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Faheem": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Haris Rauf": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Nawaz": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
+    "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
+},
+"Sanju Samson": {
+    "Shaheen Shah Afridi": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.10,'W':0.08},
+    "Faheem": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.10,'W':0.08},
+    "Haris Rauf": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.10,'W':0.08},
+    "Nawaz": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.10,'W':0.08},
+    "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
+    "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
+},
+"Shivam Dube": {
+    "Shaheen Shah Afridi": {0:0.20,1:0.20,2:0.05,3:0.02,4:0.25,6:0.20,'W':0.08},
+    "Faheem": {0:0.20,1:0.20,2:0.05,3:0.02,4:0.25,6:0.20,'W':0.08},
+    "Haris Rauf": {0:0.20,1:0.20,2:0.05,3:0.02,4:0.25,6:0.20,'W':0.08},
+    "Nawaz": {0:0.20,1:0.20,2:0.05,3:0.02,4:0.25,6:0.20,'W':0.08},
+    "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
+    "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
+},
+"Rinku Singh": {
+    "Shaheen Shah Afridi": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Faheem": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Haris Rauf": {0:0.22,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
+    "Nawaz": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
+    "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
+},
+"Axar Patel":{
+    "Shaheen Shah Afridi": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Faheem": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Haris Rauf": {0:0.22,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
+    "Nawaz": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
+    "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
+},
+"Kuldeep Yadav":{
+    "Shaheen Shah Afridi": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Faheem": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Haris Rauf": {0:0.22,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
+    "Nawaz": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
+    "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
+},
+"Varun Chakaravarthy":{
+    "Shaheen Shah Afridi": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Faheem": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Haris Rauf": {0:0.22,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
+    "Nawaz": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
+    "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
+},
+"Jasprit Bumrah":{
+    "Shaheen Shah Afridi": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Faheem": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Haris Rauf": {0:0.22,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
+    "Nawaz": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
+    "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
+    "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
+}
+}
+
+skill = {
+"Abhishek Sharma": 1.0,
+"Shubman Gill": 1.0,
+"Suryakumar Yadav": 1.0,
+"Tilak Varma": 0.95,
+"Sanju Samson": 1.0,
+"Shivam Dube": 0.95,
+"Rinku Singh": 0.90,
+"Axar Patel": 0.7,
+"Kuldeep Yadav": 0.65,
+"Varun Chakaravarthy": 0.6,
+"Jasprit Bumrah": 0.6
+}
+
+SAMPLE_MATCH = {
+    "innings_a": {"runs": runs, "bowlers": bowlers, "batters": batters},
+    "innings_b": {"runs": runsB, "bowlers": bowlersB, "batters": battersB},
+    "target": 147,
+    "total_overs": 20,
+    "max_overs_per_bowler": 4,
+    "batter_bowler_probs": batter_bowler_probs,
+    "skill": skill
+}
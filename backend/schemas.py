@@ -0,0 +1,127 @@
+"""
+Request bodies of the analysis endpoints
+"""
+
+from typing import Dict, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from innings import parse_delivery
+from predictor import OUTCOMES, PROB_TOLERANCE
+
+
+def check_deliveries(runs):
+    for i, ball in enumerate(runs):
+        try:
+            parse_delivery(ball)
+        except ValueError:
+            raise ValueError(f"delivery {i}: cannot parse {ball!r}")
+    return runs
+
+
+class InningsPayload(BaseModel):
+    """
+    One innings: deliveries as used across the backend
+    (0, 4, "W", "WD", "WD2", "NB4", "LB1", "B2", ...), the planned bowler
+    of every over and the batting order
+    """
+    runs: List[Union[int, str]]
+    bowlers: List[str] = Field(min_length=1)
+    batters: List[str] = Field(min_length=2)
+
+    @field_validator("runs")
+    @classmethod
+    def check_runs(cls, runs):
+        return check_deliveries(runs)
+
+
+class MatchPayload(BaseModel):
+    """
+    Two innings of a match
+    - innings_a is the chase, win probabilities are computed on it
+    - target defaults to the innings_b total + 1
+    - batter_bowler_probs ({batter: {bowler: {outcome: p}}}) and skill feed the
+      predictor; without batter_bowler_probs no predictions are returned.
+      Every distribution must sum to 1 (within PROB_TOLERANCE) and at least
+      one must pair a batter with a bowler of innings_a, the rest fall back
+      to averages of the given rows
+    """
+    innings_a: InningsPayload
+    innings_b: InningsPayload
+    target: Optional[int] = Field(None, ge=1)
+    total_overs: int = Field(20, ge=1, le=50)
+    max_overs_per_bowler: int = Field(4, ge=1)
+    batter_bowler_probs: Optional[Dict[str, Dict[str, Dict[Union[int, str], float]]]] = None
+    skill: Optional[Dict[str, float]] = None
+
+    @field_validator("batter_bowler_probs")
+    @classmethod
+    def outcome_keys(cls, probs):
+        """JSON object keys arrive as strings, map "4" back to 4 and keep "W" """
+        if probs is None:
+            return None
+        out = {}
+        for batter, row in probs.items():
+            out[batter] = {}
+            for bowler, dist in row.items():
+                clean = {}
+                for outcome, p in dist.items():
+                    key = str(outcome).upper()
+                    key = int(key) if key.isdigit() else key
+                    if key not in OUTCOMES:
+                        raise ValueError(f"{batter} vs {bowler}: unknown outcome {outcome!r}")
+                    if not 0 <= p <= 1:
+                        raise ValueError(f"{batter} vs {bowler}: probability of {outcome!r} is {p}")
+                    clean[key] = p
+                total = sum(clean.values())
+                if abs(total - 1.0) > PROB_TOLERANCE:
+                    raise ValueError(f"{batter} vs {bowler}: outcome probabilities sum to {total}, expected 1")
+                out[batter][bowler] = clean
+        return out
+
+    @model_validator(mode="after")
+    def probs_cover_chase(self):
+        if self.batter_bowler_probs is None:
+            return self
+        bowlers = set(self.innings_a.bowlers)
+        for batter in self.innings_a.batters:
+            if bowlers & set(self.batter_bowler_probs.get(batter, {})):
+                return self
+        raise ValueError("batter_bowler_probs has no row for any innings_a batter against an innings_a bowler")
+
+
+class BallsPayload(BaseModel):
+    """Deliveries appended to innings "a" (the chase) or "b" of a live match"""
+    innings: Literal["a", "b"]
+    balls: List[Union[int, str]] = Field(min_length=1)
+
+    @field_validator("balls")
+    @classmethod
+    def check_balls(cls, balls):
+        return check_deliveries(balls)
+
+
+class PlanBowler(BaseModel):
+    """A bowler available to optimal_bowling_plan, phases missing from phase_economy use economy"""
+    name: str
+    economy: float = Field(ge=0)
+    phase_economy: Optional[Dict[Literal["powerplay", "middle", "death"], float]] = None
+    overs_left: Optional[int] = Field(None, ge=0)
+
+
+class BowlingPlanPayload(BaseModel):
+    """
+    Bowlers and innings state to plan the remaining overs for
+    start_over overs are bowled already, the last of them by last_bowler
+    """
+    bowlers: List[PlanBowler] = Field(min_length=1)
+    total_overs: int = Field(20, ge=1, le=50)
+    max_overs_per_bowler: int = Field(4, ge=1)
+    start_over: int = Field(0, ge=0)
+    last_bowler: Optional[str] = None
+
+    @model_validator(mode="after")
+    def start_within_innings(self):
+        if self.start_over > self.total_overs:
+            raise ValueError(f"start_over {self.start_over} is past total_overs {self.total_overs}")
+        return self
@@ -1,30 +1,26 @@
-from fastapi import FastAPI
+import asyncio
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Optional
+
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from Cricket_analyzer import analyze
-from predictor import predict
-from cric import analyze_bowling_stats
-from dsa import batter_vs_bowler_graph
-from dsa_info import cricket_analysis
-from batting_sort import sort_batting_stats
-
-# Import all DSA 2.0 functions
-from dsa2 import (
-    find_weakest_bowler_per_batter,
-    find_strongest_bowler_per_batter,
-    calculate_bowler_centrality,
-    optimal_bowler_assignment,
-    OverAnalyzer,
-    PlayerStatsBST,
-    PlayerTrie,
-    optimal_bowling_allocation,
-    detect_scoring_patterns,
-    detect_duplicate_overs,
-    cluster_batters_by_common_dismissals,
-    BowlerScheduler
-)
+from fastapi.responses import StreamingResponse
+from analysis import (INNINGS_OUTPUTS, LAYOUTS, analyze_innings, build_response, innings_outputs_for,
+                      parse_sections, season_scorecard)
+from dsa2 import optimal_bowling_plan
+from predictor import predict, model_fingerprint, memo_stats
+from live import LiveMatch
+from player_index import player_index
+from lru import LockedLRUCache
+from responses import CompressionMiddleware, FastJSONResponse
+from sample_match import SAMPLE_MATCH
+from schemas import BallsPayload, BowlingPlanPayload, InningsPayload, MatchPayload
 
 # create app instance
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -32,552 +28,324 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"]
 )
+app.add_middleware(CompressionMiddleware)
 
 @app.get("/")
 def root():
     return {"message": "FastAPI backend is running!"}
 
 
-# root endpoint
-@app.post("/cricket-analysis")
-def cricket_analysis_api():
-    runs = [0,4,0,0,1,2,"W",0,1,0,0,2,0,0,"W",0,1,1,1,1,2,0,4,"W",0,0,1,0,0,4,0,0,4,6,0,1,0,4,0,0,1,1,1,1,4,1,0,0,1,1,1,1,1,0,1,1,1,0,1,0,1,1,6,1,1,1,1,0,0,0,6,0,1,"W",0,0,1,0,1,1,1,0,1,1,4,1,4,1,1,6,6,"WD",1,1,0,1,1,1,1,0,2,1,1,1,"WD",1,1,2,1,6,1,1,1,4,0,"W",2,6,1,4]
-    bowlers = ["Shaheen Shah Afridi", "Faheem", "Shaheen Shah Afridi","Faheem","Shaheen Shah Afridi","Faheem","Nawaz","Haris Rauf","Abrar Ahmed","Saim Ayub","Abrar Ahmed","Saim Ayub","Abrar Ahmed","Saim Ayub","Haris Rauf","Abrar Ahmed","Shaheen Shah Afridi","Haris Rauf","Faheem","Haris Rauf"]
-    batters = ["Abhishek Sharma","Shubman Gill","Suryakumar Yadav","Tilak Varma","Sanju Samson","Shivam Dube","Rinku Singh","Axar Patel","Kuldeep Yadav","Varun Chakaravarthy","Jasprit Bumrah"]
-
-    runsB=[0,0,0,0,4,0,"LB1",0,0,2,4,0,1,1,1,1,0,4,4,0,6,1,"B1",1,0,1,0,2,1,1,0,0,1,2,1,4,1,1,1,0,2,6,1,2,0,4,1,0,"WD",1,6,"B1",2,1,1,0,1,6,"W",1,2,1,1,4,0,4,1,1,4,0,1,1,2,"WD",0,1,"WD",2,1,"W",0,0,1,"W",1,1,2,2,0,6,"W",1,1,2,1,"W",0,1,1,"W",0,"WD",0,"W",0,"W",1,4,0,2,"W",0,2,0,0,1,1,1,"W"]
-    bowlersB=["Shivam Dube","Jasprit Bumrah","Shivam Dube","Jasprit Bumrah","Varun Chakaravarthy","Axar Patel","Kuldeep Yadav","Axar Patel","Kuldeep Yadav","Varun Chakaravarthy","Shivam Dube","Tilak Varma","Kuldeep Yadav","Axar Patel","Varun Chakaravarthy","Axar Patel","Kuldeep Yadav","Jasprit Bumrah","Varun Chakaravarthy","Jasprit Bumrah"]
-    battersB=["Sahibzada Farhan","Fakhar Zaman","Saim Ayub","Mohammad Haris","Salman Ali Agha","Hussain Talt","Mohammad Nawaz","Shaheen Afridi","Faheem Ashraf","Haris Rauf","Abrar Ahmed"]
-
-    batter_bowler_probs = {
-    "Abhishek Sharma": {
-        "Shaheen Shah Afridi": {0:0.30,1:0.25,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Faheem": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Haris Rauf": {0:0.28,1:0.27,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Nawaz": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
-        "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
-    },
-    "Shubman Gill": {
-        "Shaheen Shah Afridi": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Faheem": {0:0.20,1:0.35,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Haris Rauf": {0:0.22,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Nawaz": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
-        "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
-        "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
-    },
-    "Suryakumar Yadav": {
-        "Shaheen Shah Afridi": {0:0.20,1:0.25,2:0.05,3:0.05,4:0.25,6:0.10,'W':0.10},
-        "Faheem": {0:0.22,1:0.25,2:0.05,3:0.05,4:0.25,6:0.08,'W':0.10},
-        "Haris Rauf": {0:0.20,1:0.25,2:0.05,3:0.05,4:0.25,6:0.10,'W':0.10},
-        "Nawaz": {0:0.20,1:0.25,2:0.05,3:0.05,4:0.25,6:0.10,'W':0.10},
-        "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
-        "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
-    },
-    "Tilak Varma": {
-        "Shaheen Shah Afridi": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Faheem": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Haris Rauf": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Nawaz": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
-        "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
-    },
-    "Sanju Samson": {
-        "Shaheen Shah Afridi": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.10,'W':0.08},
-        "Faheem": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.10,'W':0.08},
-        "Haris Rauf": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.10,'W':0.08},
-        "Nawaz": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.10,'W':0.08},
-        "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
-        "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
-    },
-    "Shivam Dube": {
-        "Shaheen Shah Afridi": {0:0.20,1:0.20,2:0.05,3:0.02,4:0.25,6:0.20,'W':0.08},
-        "Faheem": {0:0.20,1:0.20,2:0.05,3:0.02,4:0.25,6:0.20,'W':0.08},
-        "Haris Rauf": {0:0.20,1:0.20,2:0.05,3:0.02,4:0.25,6:0.20,'W':0.08},
-        "Nawaz": {0:0.20,1:0.20,2:0.05,3:0.02,4:0.25,6:0.20,'W':0.08},
-        "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
-        "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
-    },
-    "Rinku Singh": {
-        "Shaheen Shah Afridi": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Faheem": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Haris Rauf": {0:0.22,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
-        "Nawaz": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
-        "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
-    },
-    "Axar Patel":{
-        "Shaheen Shah Afridi": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Faheem": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Haris Rauf": {0:0.22,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
-        "Nawaz": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
-        "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
-    },
-    "Kuldeep Yadav":{
-        "Shaheen Shah Afridi": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Faheem": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Haris Rauf": {0:0.22,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
-        "Nawaz": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
-        "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
-    },
-    "Varun Chakaravarthy":{
-        "Shaheen Shah Afridi": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Faheem": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Haris Rauf": {0:0.22,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
-        "Nawaz": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
-        "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
-    },
-    "Jasprit Bumrah":{
-        "Shaheen Shah Afridi": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Faheem": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Haris Rauf": {0:0.22,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
-        "Nawaz": {0:0.25,1:0.30,2:0.05,3:0.02,4:0.25,6:0.05,'W':0.08},
-        "Abrar Ahmed": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08},
-        "Saim Ayub": {0:0.20,1:0.30,2:0.05,3:0.02,4:0.25,6:0.08,'W':0.08}
-    }
-    }
+# Served when /cricket-analysis is posted without a body
+SAMPLE_PAYLOAD = MatchPayload(**SAMPLE_MATCH)
+
+MAX_BATCH_MATCHES = 500
+MAX_SEARCH_RESULTS = 50
+# DeliveryLog numbers innings in an int16 column
+MAX_SEASON_INNINGS = 2000
+
+
+# =============================================================================
+# EXECUTION
+# =============================================================================
+
+# Innings pipelines (and predictions) run on INNINGS_POOL and fan their
+# stages out to STAGE_POOL; separate pools so an innings job waiting on its
+# stages can never starve them of workers
+INNINGS_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="innings")
+STAGE_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="stage")
+
+def run_blocking(fn, *args):
+    """Run fn(*args) on INNINGS_POOL without blocking the event loop"""
+    return asyncio.get_running_loop().run_in_executor(INNINGS_POOL, partial(fn, *args))
+
+
+# =============================================================================
+# RESULT CACHE
+# =============================================================================
+
+# Per-innings results keyed by a content hash of the innings inputs
+RESULT_CACHE_MAX_ENTRIES = 512
+RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+def _json_size(value):
+    return len(json.dumps(value, default=str))
+
+result_cache = LockedLRUCache(RESULT_CACHE_MAX_ENTRIES, max_bytes=RESULT_CACHE_MAX_BYTES, sizeof=_json_size)
+
+def innings_key(*parts):
+    """sha1 of the repr of the inputs, e.g. (runs, bowlers, batters)"""
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+def cached_innings(runs, bowlers, batters, max_overs_per_bowler=4, total_overs=20, outputs=INNINGS_OUTPUTS):
+    """
+    analyze_innings through result_cache; an entry holds the outputs computed
+    so far for these inputs and only missing ones are run
+    """
+    key = ("innings", innings_key(runs, bowlers, batters, max_overs_per_bowler, total_overs))
+    cached = result_cache.get(key) or {}
+    missing = [name for name in outputs if name not in cached]
+    if missing:
+        computed = analyze_innings(runs, bowlers, batters, max_overs_per_bowler, total_overs, missing, STAGE_POOL)
+        cached = {**cached, **computed}
+        result_cache.put(key, cached)
+    return cached
+
+def cached_prediction(runs, bowlers, batters, target_runs, total_overs, batter_bowler_probs, skill):
+    """predict through result_cache, keyed by the chase and the matchup model"""
+    key = ("predict", innings_key(runs, bowlers, batters, target_runs, total_overs),
+           model_fingerprint(batter_bowler_probs, skill, batters, bowlers, total_overs))
+    predictingdata = result_cache.get(key)
+    if predictingdata is None:
+        predictingdata = predict(runs, batters, bowlers, target_runs, total_overs, batter_bowler_probs, skill)
+        result_cache.put(key, predictingdata)
+    return predictingdata
+
+
+async def analyze_match(match, sections=None, layout="copies"):
+    """
+    Response body for one MatchPayload, limited to the given sections
+    Both innings and the prediction run concurrently
+    """
+    sections = sections or parse_sections()
+    outputs = innings_outputs_for(sections, layout)
+    predicting = "predictions" in sections and match.batter_bowler_probs
+    a, b = match.innings_a, match.innings_b
+
+    def prediction(target):
+        return run_blocking(cached_prediction, a.runs, a.bowlers, a.batters, target, match.total_overs,
+                            match.batter_bowler_probs, match.skill or {})
+
+    jobs = [
+        run_blocking(cached_innings, a.runs, a.bowlers, a.batters, match.max_overs_per_bowler, match.total_overs,
+                     outputs),
+        run_blocking(cached_innings, b.runs, b.bowlers, b.batters, match.max_overs_per_bowler, match.total_overs,
+                     outputs + ("score",) if predicting and not match.target else outputs)
+    ]
+    if predicting and match.target:
+        jobs.append(prediction(match.target))
+    innings_a, innings_b, *predicted = await asyncio.gather(*jobs)
 
-    skill = {
-    "Abhishek Sharma": 1.0,
-    "Shubman Gill": 1.0,
-    "Suryakumar Yadav": 1.0,
-    "Tilak Varma": 0.95,
-    "Sanju Samson": 1.0,
-    "Shivam Dube": 0.95,
-    "Rinku Singh": 0.90,
-    "Axar Patel": 0.7,
-    "Kuldeep Yadav": 0.65,
-    "Varun Chakaravarthy": 0.6,
-    "Jasprit Bumrah": 0.6
-    }
+    predictingdata = []
+    if predicting:
+        # without a target the chase waits for the first-innings total
+        predictingdata = predicted[0] if predicted else await prediction(innings_b["score"]["runs"] + 1)
 
-    # predictingdata = predict(runs, batters, bowlers, 147, 20, batter_bowler_probs, skill, {})
-
-    batter_info, bowler_info, extras, head = cricket_analysis(runs, bowlers, batters)    
-    batterB_info, bowler_infoB, extrasB, headB = cricket_analysis(runsB, bowlersB, battersB) 
-    G, extrasss = batter_vs_bowler_graph(runs, bowlers, batters)
-    G_B, extrasss_B = batter_vs_bowler_graph(runsB, bowlersB, battersB)
-
-    # =============================================================================
-    # DSA 2.0 FUNCTIONS - GRAPH ALGORITHMS
-    # =============================================================================
-    
-    # 1. Matchup Analysis (Team A)
-    weakest_bowlers_teamA = find_weakest_bowler_per_batter(G)
-    strongest_bowlers_teamA = find_strongest_bowler_per_batter(G)
-    bowler_centrality_teamA = calculate_bowler_centrality(G)
-    
-    # Matchup Analysis (Team B)
-    weakest_bowlers_teamB = find_weakest_bowler_per_batter(G_B)
-    strongest_bowlers_teamB = find_strongest_bowler_per_batter(G_B)
-    bowler_centrality_teamB = calculate_bowler_centrality(G_B)
-    
-    # Optimal bowler assignment for top batters
-    top_batters_teamA = ["Abhishek Sharma", "Shubman Gill", "Suryakumar Yadav"]
-    optimal_assignment_teamA = optimal_bowler_assignment(G, top_batters_teamA)
-    
-    top_batters_teamB = ["Sahibzada Farhan", "Fakhar Zaman", "Saim Ayub"]
-    optimal_assignment_teamB = optimal_bowler_assignment(G_B, top_batters_teamB)
-
-    # =============================================================================
-    # DSA 2.0 FUNCTIONS - SLIDING WINDOW & OVERS ANALYSIS
-    # =============================================================================
-    
-    # Prefix sums for Team A
-    prefix_runs_A, prefix_wickets_A = OverAnalyzer.build_prefix_sums(head)
-    
-    # Best powerplay (6 overs)
-    best_powerplay_teamA = OverAnalyzer.best_k_consecutive_overs(head, 6)
-    best_middle_overs_teamA = OverAnalyzer.best_k_consecutive_overs(head, 4)
-    
-    # Rolling run rate
-    rolling_rr_teamA = OverAnalyzer.rolling_run_rate(head, window_size=6)
-    
-    # Same for Team B
-    prefix_runs_B, prefix_wickets_B = OverAnalyzer.build_prefix_sums(headB)
-    best_powerplay_teamB = OverAnalyzer.best_k_consecutive_overs(headB, 6)
-    best_middle_overs_teamB = OverAnalyzer.best_k_consecutive_overs(headB, 4)
-    rolling_rr_teamB = OverAnalyzer.rolling_run_rate(headB, window_size=6)
-
-    # =============================================================================
-    # DSA 2.0 FUNCTIONS - BST FOR PLAYER STATS
-    # =============================================================================
-    
-    # Build BST for Team A batters
-    bst_teamA = PlayerStatsBST()
-    for player, stats in batter_info.items():
-        bst_teamA.insert(player, stats["runs"])
-    
-    # Find batters with 30+ runs
-    batters_above_30_teamA = bst_teamA.find_first_above_threshold(30)
-    batters_above_50_teamA = bst_teamA.find_first_above_threshold(50)
-    
-    # Build BST for Team B batters
-    bst_teamB = PlayerStatsBST()
-    for player, stats in batterB_info.items():
-        bst_teamB.insert(player, stats["runs"])
-    
-    batters_above_30_teamB = bst_teamB.find_first_above_threshold(30)
-    batters_above_50_teamB = bst_teamB.find_first_above_threshold(50)
-
-    # =============================================================================
-    # DSA 2.0 FUNCTIONS - TRIE FOR PLAYER SEARCH
-    # =============================================================================
-    
-    # Build Trie for all players
-    player_trie = PlayerTrie()
-    all_players = list(batter_info.keys()) + list(bowler_info.keys()) + \
-                  list(batterB_info.keys()) + list(bowler_infoB.keys())
-    
-    for player in set(all_players):
-        player_trie.insert(player)
-    
-    # Example autocomplete searches
-    search_results_s = player_trie.search("s")
-    search_results_shah = player_trie.search("shah")
-    search_results_ab = player_trie.search("ab")
-
-    # =============================================================================
-    # DSA 2.0 FUNCTIONS - DYNAMIC PROGRAMMING
-    # =============================================================================
-    
-    # Prepare bowler data for DP allocation (Team A bowlers)
-    bowlers_for_dp_A = []
-    for bowler, stats in bowler_info.items():
-        overs = len(stats["overs"])
-        economy = stats["runs"] / overs if overs > 0 else 0
-        bowlers_for_dp_A.append({"name": bowler, "economy": economy})
-    
-    # Optimal allocation for remaining overs
-    optimal_allocation_teamA = optimal_bowling_allocation(bowlers_for_dp_A, 4, 20)
-    
-    # Same for Team B
-    bowlers_for_dp_B = []
-    for bowler, stats in bowler_infoB.items():
-        overs = len(stats["overs"])
-        economy = stats["runs"] / overs if overs > 0 else 0
-        bowlers_for_dp_B.append({"name": bowler, "economy": economy})
-    
-    optimal_allocation_teamB = optimal_bowling_allocation(bowlers_for_dp_B, 4, 20)
-
-    # =============================================================================
-    # DSA 2.0 FUNCTIONS - HASHING & PATTERN DETECTION
-    # =============================================================================
-    
-    # Detect scoring patterns
-    scoring_patterns_teamA = detect_scoring_patterns(runs, pattern_length=4)
-    scoring_patterns_teamB = detect_scoring_patterns(runsB, pattern_length=4)
-    
-    # Detect duplicate overs
-    duplicate_overs_teamA = detect_duplicate_overs(head)
-    duplicate_overs_teamB = detect_duplicate_overs(headB)
-
-    # =============================================================================
-    # DSA 2.0 FUNCTIONS - UNION-FIND (DSU)
-    # =============================================================================
-    
-    # Cluster batters by dismissal patterns
-    batter_clusters_teamA = cluster_batters_by_common_dismissals(G)
-    batter_clusters_teamB = cluster_batters_by_common_dismissals(G_B)
-
-    # =============================================================================
-    # DSA 2.0 FUNCTIONS - PRIORITY QUEUE SCHEDULING
-    # =============================================================================
-    
-    # Create bowler scheduler for Team A
-    bowlers_schedule_data_A = []
-    for bowler, stats in bowler_info.items():
-        overs_bowled = len(stats["overs"])
-        economy = stats["runs"] / overs_bowled if overs_bowled > 0 else 0
-        bowlers_schedule_data_A.append({
-            "name": bowler,
-            "economy": economy,
-            "wickets": stats["wickets"],
-            "overs_left": 4 - overs_bowled
-        })
-    
-    scheduler_A = BowlerScheduler(bowlers_schedule_data_A)
-    next_bowler_teamA = scheduler_A.get_next_bowler()
-    
-    # Same for Team B
-    bowlers_schedule_data_B = []
-    for bowler, stats in bowler_infoB.items():
-        overs_bowled = len(stats["overs"])
-        economy = stats["runs"] / overs_bowled if overs_bowled > 0 else 0
-        bowlers_schedule_data_B.append({
-            "name": bowler,
-            "economy": economy,
-            "wickets": stats["wickets"],
-            "overs_left": 4 - overs_bowled
-        })
-    
-    scheduler_B = BowlerScheduler(bowlers_schedule_data_B)
-    next_bowler_teamB = scheduler_B.get_next_bowler()
-
-    # =============================================================================
-    # ORIGINAL CODE - BATTERS
-    # =============================================================================
-    
-    batter_list = []
-    for player, stats in batter_info.items():
-        balls = stats["balls"]
-        sr = round((stats["runs"] / balls) * 100, 1) if balls > 0 else 0.0
-        batter_list.append({
-            "player": player,
-            "runs": stats["runs"],
-            "balls": balls,
-            "sr": sr,
-            "fours": stats["4s"],
-            "sixes": stats["6s"]
-        })
-
-    batterB_list = []
-    for player, stats in batterB_info.items():
-        balls = stats["balls"]
-        sr = round((stats["runs"] / balls) * 100, 1) if balls > 0 else 0.0
-        batterB_list.append({
-            "player": player,
-            "runs": stats["runs"],
-            "balls": balls,
-            "sr": sr,
-            "fours": stats["4s"],
-            "sixes": stats["6s"]
-        })
-
-    sorted_batters_teamA = sort_batting_stats(batter_list)
-    sorted_batters_teamB = sort_batting_stats(batterB_list)
-
-    # =============================================================================
-    # ORIGINAL CODE - BOWLERS
-    # =============================================================================
-   
-    bowler_list = analyze_bowling_stats(bowler_info)
-    bowler_listB = analyze_bowling_stats(bowler_infoB)
-
-    # =============================================================================
-    # ORIGINAL CODE - OVERS
-    # =============================================================================
-    
-    overs = []
-    temp = head
-    while temp:
-        overs.append({
-            "over": temp.over_num,
-            "runs": temp.runs,
-            "wickets": temp.wickets
-        })
-        temp = temp.next
-
-    oversB = []
-    temp = headB
-    while temp:
-        oversB.append({
-            "over": temp.over_num,
-            "runs": temp.runs,
-            "wickets": temp.wickets
-        })
-        temp = temp.next
-
-    over_result = []
-    for a, b in zip(oversB, overs):
-        over_result.append({
-            "over": str(a["over"]),
-            "teamA": a["runs"],
-            "teamAWickets": a["wickets"],
-            "teamB": b["runs"],
-            "teamBWickets": b["wickets"]
-        })
-
-    # =============================================================================
-    # ORIGINAL CODE - PARTNERSHIPS
-    # =============================================================================
-    
-    partnerships, o = analyze(runs, batters)
-    partnershipsB, ob = analyze(runsB, battersB)
-
-    pair_names, pair_runs, pair_balls = partnerships.display()
-    pair_namesB, pair_runsB, pair_ballsB = partnershipsB.display()
-    partnerships = [
-    {
-        "batsmen": pair.replace("-", " & "),
-        "runs": pair_runs[i],
-        "balls": pair_balls[i]
-    }
-    for i, pair in enumerate(pair_names)
-    ]
+    return build_response(innings_a, innings_b, predictingdata, sections, layout)
+
+
+def requested_sections(fields, include):
+    try:
+        return parse_sections(fields, include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def requested_layout(layout):
+    if layout not in LAYOUTS:
+        raise HTTPException(status_code=400, detail=f"unknown layout {layout!r}, expected one of {list(LAYOUTS)}")
+    return layout
 
-    partnershipsB = [
-    {
-        "batsmen": pair.replace("-", " & "),
-        "runs": pair_runsB[i],
-        "balls": pair_ballsB[i]
-    }
-    for i, pair in enumerate(pair_namesB)
-    ]
 
-    # =============================================================================
-    # ORIGINAL CODE - BATTER VS BOWLER
-    # =============================================================================
-    
-    result = {}
-    for striker in G.nodes:
-        if G.nodes[striker].get("role") != "batter":
-            continue
-
-        result[striker] = []
-        for bowler in G[striker]:
-            data = G[striker][bowler]
-            balls = data.get("balls", 0)
-            runs = data.get("runs", 0)
-            wickets = data.get("wickets", 0)
-            sr = round((runs / balls * 100), 1) if balls > 0 else 0.0
-
-            result[striker].append({
-                "bowler": bowler,
-                "runs": runs,
-                "balls": balls,
-                "wicket": wickets > 0,
-                "sr": sr
-            })
-
-    resultB = {}
-    for striker in G_B.nodes:
-        if G_B.nodes[striker].get("role") != "batter":
-            continue
-
-        resultB[striker] = []
-        for bowler in G_B[striker]:
-            data = G_B[striker][bowler]
-            balls = data.get("balls", 0)
-            runs = data.get("runs", 0)
-            wickets = data.get("wickets", 0)
-            sr = round((runs / balls * 100), 1) if balls > 0 else 0.0
-
-            resultB[striker].append({
-                "bowler": bowler,
-                "runs": runs,
-                "balls": balls,
-                "wicket": wickets > 0,
-                "sr": sr
-            })
-
-    # =============================================================================
-    # RETURN ALL DATA INCLUDING DSA 2.0 RESULTS
-    # =============================================================================
-    predictingdata = [{'over': 1, 'teamBScore': 7, 'teamBWickets': 0, 'teamBWinProb': 68.21796591959651, 'teamAWinProb': 31.78203408040349}, {'over': 2, 'teamBScore': 10, 'teamBWickets': 1, 'teamBWinProb': 53.742324673076425, 'teamAWinProb': 46.257675326923575}, {'over': 3, 'teamBScore': 12, 'teamBWickets': 2, 'teamBWinProb': 48.227957906614336, 'teamAWinProb': 51.772042093385664}, {'over': 4, 'teamBScore': 20, 'teamBWickets': 3, 'teamBWinProb': 40.12418978625597, 'teamAWinProb': 59.87581021374403}, {'over': 5, 'teamBScore': 25, 'teamBWickets': 3, 'teamBWinProb': 45.24983803557955, 'teamAWinProb': 54.75016196442045}, {'over': 6, 'teamBScore': 36, 'teamBWickets': 3, 'teamBWinProb': 51.74041644833919, 'teamAWinProb': 48.25958355166081}, {'over': 7, 'teamBScore': 42, 'teamBWickets': 3, 'teamBWinProb': 57.924471801521314, 'teamAWinProb': 42.075528198478686}, {'over': 8, 'teamBScore': 49, 'teamBWickets': 3, 'teamBWinProb': 63.94990468136794, 'teamAWinProb': 36.05009531863206}, {'over': 9, 'teamBScore': 54, 'teamBWickets': 3, 'teamBWinProb': 68.94134755137837, 'teamAWinProb': 31.05865244862163}, {'over': 10, 'teamBScore': 58, 'teamBWickets': 3, 'teamBWinProb': 71.46111692792158, 'teamAWinProb': 28.53888307207842}, {'over': 11, 'teamBScore': 69, 'teamBWickets': 3, 'teamBWinProb': 79.12771452004132, 'teamAWinProb': 20.872285479958677}, {'over': 12, 'teamBScore': 76, 'teamBWickets': 3, 'teamBWinProb': 82.5625444438397, 'teamAWinProb': 17.4374555561603}, {'over': 13, 'teamBScore': 78, 'teamBWickets': 4, 'teamBWinProb': 67.15683795391621, 'teamAWinProb': 32.84316204608379}, {'over': 14, 'teamBScore': 83, 'teamBWickets': 4, 'teamBWinProb': 59.99803676062363, 'teamAWinProb': 40.00196323937637}, {'over': 15, 'teamBScore': 100, 'teamBWickets': 4, 'teamBWinProb': 80.68756681575616, 'teamAWinProb': 19.312433184243844}, {'over': 16, 'teamBScore': 111, 'teamBWickets': 4, 'teamBWinProb': 84.6291988851647, 'teamAWinProb': 15.370801114835302}, {'over': 17, 'teamBScore': 117, 'teamBWickets': 4, 'teamBWinProb': 71.51108119427836, 'teamAWinProb': 28.48891880572164}, {'over': 18, 'teamBScore': 130, 'teamBWickets': 4, 'teamBWinProb': 82.57396638819567, 'teamAWinProb': 17.42603361180433}, {'over': 19, 'teamBScore': 137, 'teamBWickets': 5, 'teamBWinProb': 69.32834538728001, 'teamAWinProb': 30.67165461271999}, {'over': 19.1, 'teamBScore': 139, 'teamBWickets': 5, 'teamBWinProb': 72.08309282834001, 'teamAWinProb': 27.916907171659986}, {'over': 19.2, 'teamBScore': 145, 'teamBWickets': 5, 'teamBWinProb': 96.245191194, 'teamAWinProb': 3.7548088059999998}, {'over': 19.3, 'teamBScore': 146, 'teamBWickets': 5, 'teamBWinProb': 96.43538749999999, 'teamAWinProb': 3.5646125000000097}, {'over': 19.4, 'teamBScore': 150, 'teamBWickets': 5, 'teamBWinProb': 100.0, 'teamAWinProb': 0.0}]
+# =============================================================================
+# PLAYER SEARCH
+# =============================================================================
+
+def match_players(match):
+    return [name for inn in (match.innings_a, match.innings_b) for name in inn.batters + inn.bowlers]
+
+# Loaded once per process; every posted match (analyzed or live) counts one
+# appearance for each of its players
+player_index.add(match_players(SAMPLE_PAYLOAD))
+
+
+@app.get("/players/search")
+def search_players(q: str, k: int = 10, fuzzy: bool = True):
+    """
+    Autocomplete over every player seen by this process: prefix of any name
+    token (e.g. a surname), plus matches one typo away when fuzzy
+    """
+    if not 1 <= k <= MAX_SEARCH_RESULTS:
+        raise HTTPException(status_code=400, detail=f"k must be between 1 and {MAX_SEARCH_RESULTS}")
+    return {"query": q, "results": player_index.search(q, k, fuzzy)}
+
+
+@app.get("/cache-stats")
+def cache_stats():
+    """Hit/miss/eviction counters of the result cache and the predictor memos"""
+    return {"results": result_cache.stats(), "predictor": memo_stats()}
+
+
+# root endpoint
+@app.post("/cricket-analysis")
+async def cricket_analysis_api(match: Optional[MatchPayload] = None, fields: Optional[str] = None,
+                               include: Optional[str] = None, layout: str = "copies"):
+    """
+    Analysis of the posted match, or of the sample match without a body
+    fields / include: comma separated sections to compute (default all)
+    layout=index: sorted batter / bowler lists as index permutations
+    """
+    sections = requested_sections(fields, include)
+    layout = requested_layout(layout)
+    if match is None:
+        match = SAMPLE_PAYLOAD
+    else:
+        player_index.record(match_players(match))
+    return FastJSONResponse(await analyze_match(match, sections, layout))
+
+
+@app.post("/cricket-analysis/batch")
+async def cricket_analysis_batch(matches: List[MatchPayload], fields: Optional[str] = None,
+                                 include: Optional[str] = None, layout: str = "copies"):
+    """analyze_match for every match, results in request order"""
+    if len(matches) > MAX_BATCH_MATCHES:
+        raise HTTPException(status_code=413, detail=f"at most {MAX_BATCH_MATCHES} matches per batch")
+    sections = requested_sections(fields, include)
+    layout = requested_layout(layout)
+    for match in matches:
+        player_index.record(match_players(match))
+    results = await asyncio.gather(*[analyze_match(match, sections, layout) for match in matches])
+    return FastJSONResponse({"results": list(results)})
+
+
+@app.post("/season-scorecard")
+async def season_scorecard_api(innings: List[InningsPayload]):
+    """Batting, bowling and extras totals over many innings (e.g. a season archive)"""
+    if len(innings) > MAX_SEASON_INNINGS:
+        raise HTTPException(status_code=413, detail=f"at most {MAX_SEASON_INNINGS} innings per request")
+    return FastJSONResponse(await run_blocking(season_scorecard, [(inn.runs, inn.bowlers, inn.batters)
+                                                                  for inn in innings]))
+
+
+@app.post("/bowling-plan")
+async def bowling_plan_api(payload: BowlingPlanPayload):
+    """
+    Cheapest over-by-over plan for the rest of an innings (no consecutive
+    overs, per-phase economies); post again after every over to re-plan
+    """
+    bowlers = [bowler.model_dump(exclude_none=True) for bowler in payload.bowlers]
+    return await run_blocking(optimal_bowling_plan, bowlers, payload.max_overs_per_bowler, payload.total_overs,
+                              None, payload.start_over, payload.last_bowler)
+
+
+# =============================================================================
+# LIVE MATCHES
+# =============================================================================
+
+# match id -> LiveMatch
+live_matches = {}
+
+# Seconds between SSE keep-alive comments on an idle stream
+SSE_KEEPALIVE = 15
+
+def get_live_match(match_id):
+    live = live_matches.get(match_id)
+    if live is None:
+        raise HTTPException(status_code=404, detail=f"no live match {match_id!r}")
+    return live
+
+def sse_message(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/live/{match_id}")
+async def create_live_match(match_id: str, match: MatchPayload):
+    """
+    Start (or restart) a live match from the deliveries bowled so far.
+    The match is built and snapshotted on a worker thread before it is
+    registered, so no append can touch it meanwhile.
+    """
+    live = await run_blocking(LiveMatch, match)
+    snapshot = await run_blocking(live.snapshot)
+    live_matches[match_id] = live
+    player_index.record(match_players(match))
+    return snapshot
+
+
+# Live handlers are async so they run on the event loop, like append_balls,
+# and never see a match halfway through apply
+@app.delete("/live/{match_id}")
+async def delete_live_match(match_id: str):
+    get_live_match(match_id)
+    del live_matches[match_id]
+    return {"deleted": match_id}
+
+
+@app.get("/live/{match_id}")
+async def live_match_snapshot(match_id: str):
+    return get_live_match(match_id).snapshot()
+
+
+@app.post("/live/{match_id}/balls")
+async def append_balls(match_id: str, payload: BallsPayload):
+    """
+    Append deliveries to one innings; the changed sections are pushed to
+    every subscriber and returned.
+    Runs on the event loop (apply is O(1)) so subscriber queues are only
+    touched from the loop thread; the match lock keeps concurrent appends
+    to one match in order. Balls after the innings ends are not applied:
+    they come back in "rejected" with innings_over set, and a 409 is
+    raised only when nothing could be applied.
+    """
+    live = get_live_match(match_id)
+    events = []
+    applied = 0
+    async with live.lock:
+        for ball in payload.balls:
+            changed = live.apply(payload.innings, ball)
+            if changed is None:
+                break
+            events.extend(changed)
+            applied += 1
+    if applied == 0:
+        raise HTTPException(status_code=409, detail=f"innings {payload.innings} is over")
     return {
-        # Original data
-        "batters": batter_list,
-        "battersB": batterB_list,
-
-        "batters_sorted_runs": sorted_batters_teamA["sorted_by_runs"],
-        "batters_sorted_sr": sorted_batters_teamA["sorted_by_sr"],
-        "batters_sorted_fours": sorted_batters_teamA["sorted_by_fours"],
-        "batters_sorted_sixes": sorted_batters_teamA["sorted_by_sixes"],
-
-        "battersB_sorted_runs": sorted_batters_teamB["sorted_by_runs"],
-        "battersB_sorted_sr": sorted_batters_teamB["sorted_by_sr"],
-        "battersB_sorted_fours": sorted_batters_teamB["sorted_by_fours"],
-        "battersB_sorted_sixes": sorted_batters_teamB["sorted_by_sixes"],
-        
-        "bowlers_wickets": bowler_list["sorted_by_wickets"],
-        "bowlers_runs": bowler_list["sorted_by_runs"],
-        "bowlers_economy": bowler_list["sorted_by_economy"],
-        "bowlers_wicketsB": bowler_listB["sorted_by_wickets"],
-        "bowlers_runsB": bowler_listB["sorted_by_runs"],
-        "bowlers_economyB": bowler_listB["sorted_by_economy"],
-        
-        "extras": extras,
-        "overs": over_result,
-        "batterVsBowler": result,
-        "batterVsBowlerB": resultB,
-        "partnerships": partnerships,
-        "partnershipsB": partnershipsB,
-        "predictingData": predictingdata,
-        
-        # DSA 2.0 - Graph Algorithms
-        "graph_analysis": {
-            "teamA": {
-                "weakest_bowler_matchups": weakest_bowlers_teamA,
-                "strongest_bowler_matchups": strongest_bowlers_teamA,
-                "bowler_centrality": bowler_centrality_teamA,
-                "optimal_assignment": optimal_assignment_teamA
-            },
-            "teamB": {
-                "weakest_bowler_matchups": weakest_bowlers_teamB,
-                "strongest_bowler_matchups": strongest_bowlers_teamB,
-                "bowler_centrality": bowler_centrality_teamB,
-                "optimal_assignment": optimal_assignment_teamB
-            }
-        },
-        
-        # DSA 2.0 - Sliding Window & Overs Analysis
-        "over_analysis": {
-            "teamA": {
-                "best_powerplay": best_powerplay_teamA,
-                "best_middle_overs": best_middle_overs_teamA,
-                "rolling_run_rate": rolling_rr_teamA,
-                "prefix_runs": prefix_runs_A,
-                "prefix_wickets": prefix_wickets_A
-            },
-            "teamB": {
-                "best_powerplay": best_powerplay_teamB,
-                "best_middle_overs": best_middle_overs_teamB,
-                "rolling_run_rate": rolling_rr_teamB,
-                "prefix_runs": prefix_runs_B,
-                "prefix_wickets": prefix_wickets_B
-            }
-        },
-        
-        # DSA 2.0 - BST Search Results
-        "bst_search": {
-            "teamA": {
-                "batters_above_30": batters_above_30_teamA,
-                "batters_above_50": batters_above_50_teamA
-            },
-            "teamB": {
-                "batters_above_30": batters_above_30_teamB,
-                "batters_above_50": batters_above_50_teamB
-            }
-        },
-        
-        # DSA 2.0 - Trie Autocomplete
-        "player_search": {
-            "search_s": search_results_s,
-            "search_shah": search_results_shah,
-            "search_ab": search_results_ab
-        },
-        
-        # DSA 2.0 - Dynamic Programming
-        "optimal_bowling_allocation": {
-            "teamA": optimal_allocation_teamA,
-            "teamB": optimal_allocation_teamB
-        },
-        
-        # DSA 2.0 - Pattern Detection
-        "pattern_detection": {
-            "teamA": {
-                "scoring_patterns": scoring_patterns_teamA,
-                "duplicate_overs": duplicate_overs_teamA
-            },
-            "teamB": {
-                "scoring_patterns": scoring_patterns_teamB,
-                "duplicate_overs": duplicate_overs_teamB
-            }
-        },
-        
-        # DSA 2.0 - Union-Find Clusters
-        "batter_clusters": {
-            "teamA": batter_clusters_teamA,
-            "teamB": batter_clusters_teamB
-        },
-        
-        # DSA 2.0 - Priority Queue Scheduling
-        "next_bowler_recommendation": {
-            "teamA": next_bowler_teamA,
-            "teamB": next_bowler_teamB
-        }
-    }
\ No newline at end of file
+        "version": live.version,
+        "events": events,
+        "applied": applied,
+        "rejected": payload.balls[applied:],
+        "innings_over": live.innings_over(payload.innings)
+    }
+
+
+@app.get("/live/{match_id}/events")
+async def live_events(match_id: str):
+    """
+    Server-sent events: a snapshot, then every change as it happens. A
+    client that falls too far behind gets a fresh snapshot in place of the
+    changes it missed.
+    """
+    live = get_live_match(match_id)
+    queue = live.subscribe()
+
+    async def stream():
+        try:
+            yield sse_message("snapshot", live.snapshot_event())
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield sse_message(event["event"], event)
+        finally:
+            live.unsubscribe(queue)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.websocket("/live/{match_id}/ws")
+async def live_socket(websocket: WebSocket, match_id: str):
+    """WebSocket flavour of /live/{match_id}/events"""
+    live = live_matches.get(match_id)
+    if live is None:
+        await websocket.close(code=4404)
+        return
+    await websocket.accept()
+    queue = live.subscribe()
+    try:
+        await websocket.send_json(live.snapshot_event())
+        while True:
+            await websocket.send_json(await queue.get())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        live.unsubscribe(queue)